@@ -1,10 +1,13 @@
 import os
+import copy
 import time
 import json
+import random
 import traceback
 from datetime import datetime, timedelta
+from functools import partial
 from typing import Any, List, Dict, Tuple, Optional
-from threading import Thread
+from threading import Lock, Thread
 
 import pytz
 from apscheduler.schedulers.background import BackgroundScheduler
@@ -18,6 +21,28 @@ from app.plugins import _PluginBase
 from app.schemas.types import EventType, NotificationType
 from app.utils.timer import TimerUtils
 
+from .sites.runtime import CancelToken, RunContext, browser_slots
+from .sites.display import virtual_display
+from .sites.engine import create_engine
+from .sites.lean import DEFAULT_BLOCKED_HOSTS
+from .sites.nexusphp import NEXUS_PROFILE, FingerprintCache, create_http_session, fingerprint
+from .sites.profile import BUILTIN_PROFILES, MODE_BROWSER, compile_profile, custom_profile
+from .sites.ratelimit import host_limiter
+from .sites.cache import asset_cache, disk_cache_dirs
+from .sites.memory import memory_admission
+from .sites.reaper import browser_reaper
+from .sites.userdata import BrowserProfiles
+from .checkpoint import RunCheckpoints
+from .progress import ProgressNotifier, RunProgress
+from .stats import SelectorCache, SiteStats, RunReport
+
+# 预设站点域名
+PRESET_SITES = {
+    "hh": "hhanclub.top",
+    "ou": "ourbits.club",
+    "ttg": "totheglory.im"
+}
+
 
 class QdSignIn(_PluginBase):
     # 插件名称
@@ -27,7 +52,7 @@ class QdSignIn(_PluginBase):
     # 插件图标
     plugin_icon = "qdsignin.png"
     # 插件版本
-    plugin_version = "1.2"
+    plugin_version = "2.0"
     # 插件作者
     plugin_author = "A-FEI-"
     # 作者主页
@@ -50,13 +75,83 @@ class QdSignIn(_PluginBase):
     _sites: list = []
     _custom_sites: list = []
     _manual_cookies: dict = {}
+    # 单站点超时（秒）
+    _site_timeout: int = 300
+    # 全局运行超时（秒）
+    _run_timeout: int = 1800
+    # 站点独立执行周期
+    _site_schedules: str = ""
+    # 同时运行的浏览器数量上限
+    _max_browsers: int = 1
+    # 分组任务启动随机偏移（秒）
+    _stagger_jitter: int = 300
+    # 持久化浏览器配置
+    _persist_profile: bool = False
+    # 单站点浏览器配置大小上限（MB）
+    _profile_size: int = 200
+    # 轻量浏览器模式
+    _lean_mode: bool = False
+    # 浏览器引擎
+    _engine: str = "selenium"
+    # 轻量模式下屏蔽的第三方域名
+    _blocked_hosts: str = "\n".join(DEFAULT_BLOCKED_HOSTS)
+
+    # 同一站点多个账号同时签到的数量
+    _account_concurrency: int = 2
+    # 单个浏览器进程树的内存上限（MB）和存活上限（秒）
+    _browser_memory: int = 1024
+    _browser_lifetime: int = 900
+    # 启动新浏览器后需要保留的可用内存（MB）
+    _min_free_memory: int = 512
+    # 远程WebDriver地址和会话池大小
+    _remote_url: str = ""
+    _remote_pool: int = 2
+    # 浏览器共享静态资源缓存及大小上限（MB）
+    _asset_cache: bool = False
+    _asset_cache_size: int = 100
+    # 同一域名的请求间隔（秒）和允许连续发出的请求数
+    _host_interval: int = 5
+    _host_burst: int = 1
+
+    # 签到MoviePilot中的全部站点及批量HTTP签到并发数
+    _mp_sites: bool = False
+    _http_concurrency: int = 8
+    # 站点类型识别缓存
+    _fingerprints: Optional[FingerprintCache] = None
+
+    # 逐站点发送增量通知及最小间隔（秒）
+    _progress_notify: bool = False
+    _progress_interval: int = 60
+    # 正在进行的运行进度和最近一次完成的运行进度
+    _progress_runs: Optional[Dict[str, RunProgress]] = None
+    _last_progress: Optional[RunProgress] = None
+
+    # 取消令牌，停止插件时中止正在进行的签到
+    _cancel_token: Optional[CancelToken] = None
+    # 同一时间只允许一个签到运行，避免并发运行互相覆盖进度、检查点和选择器记录
+    _run_lock = Lock()
+    # 最近一次插件初始化耗时（毫秒）
+    _init_ms: int = 0
+    # 配置和签到历史版本号，用于缓存配置页面和详情页面
+    _config_version: int = 0
+    _history_version: int = 0
+    _form_cache: Optional[Tuple[int, Tuple[List[dict], Dict[str, Any]]]] = None
+    _page_cache: Optional[Tuple[int, List[dict]]] = None
+    _dashboard_cache: Optional[Tuple[Tuple[int, str], List[dict]]] = None
+    # 各站点最近一次签到结果
+    _site_summary: Optional[Dict[str, dict]] = None
+    # 最近一次运行的耗时指标
+    _last_run: Optional[dict] = None
 
     def init_plugin(self, config: dict = None):
         """
         初始化插件
         """
-        # 停止现有任务
-        self.stop_service()
+        # 浏览器、OpenCV等重量级依赖只在签到时按需加载，初始化不引入
+        init_start = time.monotonic()
+        # 已初始化时按配置差异更新：不中止进行中的签到，不关闭预热的虚拟显示和浏览器配置
+        previous = self.__get_config() if self._cancel_token else None
+        previous_sites = self.__get_site_settings() if previous else {}
 
         # 配置
         if config:
@@ -66,6 +161,31 @@ class QdSignIn(_PluginBase):
             self._notify = config.get("notify")
             self._sites = config.get("sites") or []
             self._custom_sites = config.get("custom_sites") or []
+            self._site_timeout = self.__to_int(config.get("site_timeout"), 300)
+            self._run_timeout = self.__to_int(config.get("run_timeout"), 1800)
+            self._site_schedules = config.get("site_schedules") or ""
+            self._max_browsers = self.__to_int(config.get("max_browsers"), 1)
+            self._stagger_jitter = self.__to_int(config.get("stagger_jitter"), 300)
+            self._persist_profile = config.get("persist_profile") or False
+            self._profile_size = self.__to_int(config.get("profile_size"), 200)
+            self._lean_mode = config.get("lean_mode") or False
+            self._engine = config.get("engine") or "selenium"
+            self._progress_notify = config.get("progress_notify") or False
+            self._mp_sites = config.get("mp_sites") or False
+            self._http_concurrency = max(self.__to_int(config.get("http_concurrency"), 8), 1)
+            self._account_concurrency = max(self.__to_int(config.get("account_concurrency"), 2), 1)
+            self._browser_memory = self.__to_int(config.get("browser_memory"), 1024)
+            self._browser_lifetime = self.__to_int(config.get("browser_lifetime"), 900)
+            self._min_free_memory = self.__to_int(config.get("min_free_memory"), 512)
+            self._remote_url = (config.get("remote_url") or "").strip()
+            self._remote_pool = max(self.__to_int(config.get("remote_pool"), 2), 1)
+            self._asset_cache = config.get("asset_cache") or False
+            self._asset_cache_size = max(self.__to_int(config.get("asset_cache_size"), 100), 10)
+            self._host_interval = self.__to_int(config.get("host_interval"), 5)
+            self._host_burst = max(self.__to_int(config.get("host_burst"), 1), 1)
+            self._progress_interval = self.__to_int(config.get("progress_interval"), 60)
+            if config.get("blocked_hosts") is not None:
+                self._blocked_hosts = config.get("blocked_hosts")
 
             # 处理手动Cookie配置
             self._manual_cookies = {}
@@ -76,13 +196,49 @@ class QdSignIn(_PluginBase):
             if config.get("ttg_cookie"):
                 self._manual_cookies["ttg"] = config.get("ttg_cookie")
 
-            # 保存配置
+        current = self.__get_config()
+        changed = {key for key, value in current.items() if previous is None or previous.get(key) != value}
+
+        # 首次初始化或停用插件时停止现有任务，其余配置变化不影响进行中的签到
+        if previous is None or not self._enabled:
+            self.stop_service()
+            self._cancel_token = CancelToken()
+
+        # 保存配置，配置未变化且无需规范化时不写入
+        if config and (changed or any(key in config and config[key] != value for key, value in current.items())):
             self.__update_config()
 
+        memory_admission.reserve_mb = self._min_free_memory
+        if "host_interval" in changed or "host_burst" in changed:
+            host_limiter.configure(self._host_interval, self._host_burst)
+        if "asset_cache_size" in changed:
+            asset_cache.resize(self._asset_cache_size)
+            disk_cache_dirs.configure(self.get_data_path() / "cache", self._asset_cache_size)
+        if not self._asset_cache and "asset_cache" in changed:
+            # 关闭资源缓存后释放内存缓存并删除磁盘缓存
+            asset_cache.resize(0)
+            asset_cache.resize(self._asset_cache_size)
+            disk_cache_dirs.clear()
+        if "max_browsers" in changed:
+            browser_slots.resize(self._max_browsers)
+        browser_reaper.configure(state_file=self.get_data_path() / "browser_processes.json",
+                                 max_rss_mb=self._browser_memory, max_lifetime=self._browser_lifetime)
+        if previous is None:
+            # 结束上一次运行或MoviePilot重启前遗留的浏览器进程
+            reaped = browser_reaper.reap("插件启动时清理")
+            if reaped:
+                logger.info(f"插件启动时结束了 {len(reaped)} 个残留浏览器进程")
+        if not self._persist_profile and "persist_profile" in changed:
+            # 关闭持久化配置后删除已保存的浏览器配置
+            self.__get_profiles().clear()
+        elif previous:
+            self.__invalidate_sites(previous_sites)
+
         # 立即运行一次
         if self._onlyonce:
             # 定时服务
-            self._scheduler = BackgroundScheduler(timezone=settings.TZ)
+            if not self._scheduler:
+                self._scheduler = BackgroundScheduler(timezone=settings.TZ)
             logger.info("站点签到助手启动，立即运行一次")
             self._scheduler.add_job(func=self.sign_in, trigger='date',
                                     run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=3),
@@ -94,30 +250,146 @@ class QdSignIn(_PluginBase):
             self.__update_config()
 
             # 启动任务
-            if self._scheduler.get_jobs():
+            if self._scheduler.get_jobs() and not self._scheduler.running:
                 self._scheduler.print_jobs()
                 self._scheduler.start()
 
+        # 继续因重启或停用中断的运行
+        if self._enabled and "enabled" in changed:
+            self.__schedule_resume()
+
+        self._init_ms = int((time.monotonic() - init_start) * 1000)
+        logger.debug(f"站点签到助手初始化耗时 {self._init_ms} ms")
+
+    def __get_checkpoints(self) -> RunCheckpoints:
+        return RunCheckpoints(lambda: self.get_data("run_checkpoints"),
+                              lambda data: self.save_data("run_checkpoints", data))
+
+    def __schedule_resume(self):
+        """
+        当天有未完成的运行时，稍后继续签到其中未完成的站点
+        """
+        run_ids = self.__get_checkpoints().pending()
+        if not run_ids:
+            return
+        if not self._scheduler:
+            self._scheduler = BackgroundScheduler(timezone=settings.TZ)
+        for run_id in run_ids:
+            logger.info(f"发现未完成的签到运行 {run_id}，稍后继续签到剩余站点")
+            self._scheduler.add_job(func=self.__resume_run, args=[run_id], trigger='date',
+                                    run_date=datetime.now(tz=pytz.timezone(settings.TZ)) + timedelta(seconds=10),
+                                    name="站点签到助手-继续签到")
+        if not self._scheduler.running:
+            self._scheduler.start()
+
+    def __resume_run(self, run_id: str):
+        """
+        等待被中止的原运行退出后继续签到
+        """
+        deadline = time.monotonic() + 120
+        while self._progress_runs and run_id in self._progress_runs and time.monotonic() < deadline:
+            time.sleep(1)
+        self.sign_in(resume=run_id)
+
     def get_state(self) -> bool:
         return self._enabled
 
+    def __get_profiles(self) -> BrowserProfiles:
+        """
+        持久化浏览器配置管理
+        """
+        return BrowserProfiles(self.get_data_path() / "profiles", max_size_mb=self._profile_size)
+
+    @staticmethod
+    def __to_int(value: Any, default: int) -> int:
+        """
+        转换数值配置，非法值使用默认值
+        """
+        try:
+            return max(int(value), 0)
+        except (TypeError, ValueError):
+            return default
+
     def __update_config(self):
         """
         保存配置
         """
-        self.update_config(
-            {
-                "enabled": self._enabled,
-                "notify": self._notify,
-                "cron": self._cron,
-                "onlyonce": self._onlyonce,
-                "sites": self._sites,
-                "custom_sites": self._custom_sites,
-                "hh_cookie": self._manual_cookies.get("hh", ""),
-                "ou_cookie": self._manual_cookies.get("ou", ""),
-                "ttg_cookie": self._manual_cookies.get("ttg", ""),
-            }
-        )
+        self._config_version += 1
+        self.update_config(self.__get_config())
+
+    def __get_site_settings(self) -> Dict[str, str]:
+        """
+        各站点（账号）影响签到方式的配置，用于识别配置变化的站点
+        """
+        site_settings = {}
+        for site in PRESET_SITES:
+            for account, cookie in self.__manual_accounts(site):
+                site_settings[self._result_key(site, account)] = cookie
+        for site_config in self._parse_custom_sites():
+            key = self._result_key(site_config['name'], site_config.get('account', ''))
+            site_settings[key] = json.dumps(site_config, sort_keys=True, ensure_ascii=False)
+        return site_settings
+
+    def __invalidate_sites(self, previous_sites: Dict[str, str]):
+        """
+        只失效配置发生变化的站点的浏览器配置预热标记和选择器命中记录
+        """
+        current_sites = self.__get_site_settings()
+        changed = {site.lower() for site in set(previous_sites) | set(current_sites)
+                   if previous_sites.get(site) != current_sites.get(site)}
+        if not changed:
+            return
+        logger.info(f"以下站点配置已变化：{', '.join(sorted(changed))}")
+        if self._persist_profile:
+            profiles = self.__get_profiles()
+            for site in changed:
+                profiles.invalidate(site)
+        selector_hits = self.get_data("selector_hits") or {}
+        stale = [site for site in selector_hits if site.lower() in changed]
+        if stale:
+            for site in stale:
+                selector_hits.pop(site)
+            self.save_data("selector_hits", selector_hits)
+
+    def __get_config(self) -> Dict[str, Any]:
+        """
+        当前配置
+        """
+        return {
+            "enabled": self._enabled,
+            "notify": self._notify,
+            "cron": self._cron,
+            "onlyonce": self._onlyonce,
+            "sites": self._sites,
+            "custom_sites": self._custom_sites,
+            "hh_cookie": self._manual_cookies.get("hh", ""),
+            "ou_cookie": self._manual_cookies.get("ou", ""),
+            "ttg_cookie": self._manual_cookies.get("ttg", ""),
+            "site_timeout": self._site_timeout,
+            "run_timeout": self._run_timeout,
+            "site_schedules": self._site_schedules,
+            "max_browsers": self._max_browsers,
+            "stagger_jitter": self._stagger_jitter,
+            "persist_profile": self._persist_profile,
+            "profile_size": self._profile_size,
+            "lean_mode": self._lean_mode,
+            "engine": self._engine,
+            "blocked_hosts": self._blocked_hosts,
+            "progress_notify": self._progress_notify,
+            "progress_interval": self._progress_interval,
+            "mp_sites": self._mp_sites,
+            "http_concurrency": self._http_concurrency,
+            "account_concurrency": self._account_concurrency,
+            "browser_memory": self._browser_memory,
+            "browser_lifetime": self._browser_lifetime,
+            "min_free_memory": self._min_free_memory,
+            "remote_url": self._remote_url,
+            "remote_pool": self._remote_pool,
+            "asset_cache": self._asset_cache,
+            "asset_cache_size": self._asset_cache_size,
+            "host_interval": self._host_interval,
+            "host_burst": self._host_burst,
+        }
 
     @staticmethod
     def get_command() -> List[Dict[str, Any]]:
@@ -144,49 +416,163 @@ class QdSignIn(_PluginBase):
             "methods": ["GET"],
             "summary": "站点签到",
             "description": "执行站点签到操作",
+        }, {
+            "path": "/qd_signin/progress",
+            "endpoint": self.progress_api,
+            "methods": ["GET"],
+            "summary": "签到进度",
+            "description": "获取正在进行的签到运行的实时进度",
         }]
 
+    def get_actions(self) -> List[Dict[str, Any]]:
+        """
+        获取插件工作流动作
+        """
+        actions = [
+            {
+                "id": "signin_all",
+                "name": "签到全部站点",
+                "func": self.action_signin,
+                "kwargs": {}
+            },
+            {
+                "id": "signin_unsigned",
+                "name": "签到今日未成功的站点",
+                "func": self.action_signin,
+                "kwargs": {"unsigned": True}
+            },
+            {
+                "id": "signin_workflow_sites",
+                "name": "签到工作流中的站点",
+                "func": self.action_signin,
+                "kwargs": {"from_content": True}
+            },
+            {
+                "id": "probe_cookies",
+                "name": "检测站点Cookie",
+                "func": self.action_probe_cookies,
+                "kwargs": {}
+            }
+        ]
+        for site in self._get_all_sites():
+            actions.append({
+                "id": f"signin_{site}",
+                "name": f"签到站点 {site}",
+                "func": self.action_signin,
+                "kwargs": {"sites": [site]}
+            })
+        return actions
+
     def get_service(self) -> List[Dict[str, Any]]:
         """
         注册插件公共服务
         """
-        if self._enabled and self._cron:
+        if not self._enabled:
+            return []
+        # 配置了独立执行周期的站点单独注册服务，其余站点使用全局周期
+        site_schedules = self._parse_site_schedules()
+        ret_jobs = self.__get_group_services(site_schedules)
+        if site_schedules:
+            default_sites = [site for site in self._get_all_sites() if site not in site_schedules]
+            if not default_sites:
+                return ret_jobs
+            func = partial(self.sign_in, sites=default_sites)
+        else:
+            func = self.sign_in
+        if self._cron:
             try:
-                return [{
+                ret_jobs.append({
                     "id": "QdSignIn",
                     "name": "站点签到助手服务",
                     "trigger": CronTrigger.from_crontab(self._cron),
-                    "func": self.sign_in,
+                    "func": func,
                     "kwargs": {}
-                }]
+                })
             except Exception as err:
                 logger.error(f"定时任务配置错误：{str(err)}")
-        elif self._enabled:
+        else:
             # 随机时间
             triggers = TimerUtils.random_scheduler(num_executions=2,
                                                    begin_hour=9,
                                                    end_hour=23,
                                                    max_interval=6 * 60,
                                                    min_interval=2 * 60)
-            ret_jobs = []
             for trigger in triggers:
                 ret_jobs.append({
                     "id": f"QdSignIn|{trigger.hour}:{trigger.minute}",
                     "name": "站点签到助手服务",
                     "trigger": "cron",
-                    "func": self.sign_in,
+                    "func": func,
                     "kwargs": {
                         "hour": trigger.hour,
                         "minute": trigger.minute
                     }
                 })
-            return ret_jobs
-        return []
+        return ret_jobs
+
+    def __get_group_services(self, site_schedules: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        按执行周期分组注册站点服务，分组启动时间加入随机偏移错开浏览器启动
+        """
+        groups: Dict[str, List[str]] = {}
+        for site, schedule in site_schedules.items():
+            groups.setdefault(schedule, []).append(site)
+
+        ret_jobs = []
+        for schedule, sites in groups.items():
+            service = {
+                "id": f"QdSignIn|{','.join(sites)}",
+                "name": f"站点签到助手服务（{','.join(sites)}）",
+                "func": partial(self.sign_in, sites=sites)
+            }
+            try:
+                if "-" in schedule and ":" in schedule:
+                    # 时间窗口，按日期和分组确定窗口内的启动时间，当天多次注册服务时保持不变
+                    begin, end = [self.__to_minutes(value) for value in schedule.split("-", 1)]
+                    if end <= begin:
+                        end += 24 * 60
+                    seed = f"{datetime.now().strftime('%Y-%m-%d')}|{schedule}|{','.join(sites)}"
+                    start = random.Random(seed).randint(begin, end) % (24 * 60)
+                    service["trigger"] = CronTrigger(hour=start // 60, minute=start % 60,
+                                                     jitter=self._stagger_jitter or None,
+                                                     timezone=settings.TZ)
+                    service["kwargs"] = {}
+                else:
+                    fields = schedule.split()
+                    if len(fields) != 5:
+                        raise ValueError(f"cron表达式需要5个字段：{schedule}")
+                    service["trigger"] = CronTrigger(minute=fields[0], hour=fields[1], day=fields[2],
+                                                     month=fields[3], day_of_week=fields[4],
+                                                     jitter=self._stagger_jitter or None,
+                                                     timezone=settings.TZ)
+                    service["kwargs"] = {}
+            except Exception as err:
+                logger.error(f"站点 {','.join(sites)} 执行周期配置错误：{str(err)}")
+                continue
+            ret_jobs.append(service)
+        return ret_jobs
+
+    @staticmethod
+    def __to_minutes(value: str) -> int:
+        """
+        HH:MM转换为当天分钟数
+        """
+        hour, minute = value.strip().split(":", 1)
+        return (int(hour) % 24) * 60 + int(minute) % 60
 
     def get_form(self) -> Tuple[List[dict], Dict[str, Any]]:
         """
         拼装插件配置页面，需要返回两块数据：1、页面配置；2、数据结构
         """
+        # 配置未变化时直接返回缓存
+        if not self._form_cache or self._form_cache[0] != self._config_version:
+            self._form_cache = (self._config_version, self.__build_form())
+        return self._form_cache[1]
+
+    def __build_form(self) -> Tuple[List[dict], Dict[str, Any]]:
+        """
+        构建配置页面
+        """
         # 站点选项
         site_options = [
             {"title": "HH (hhanclub.top)", "value": "hh"},
@@ -248,12 +634,411 @@ class QdSignIn(_PluginBase):
                                         }
                                     }
                                 ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'persist_profile',
+                                            'label': '持久化浏览器配置',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'lean_mode',
+                                            'label': '轻量浏览器模式',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'asset_cache',
+                                            'label': '静态资源缓存',
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VCronField',
+                                        'props': {
+                                            'model': 'cron',
+                                            'label': '执行周期',
+                                            'placeholder': '5位cron表达式，留空自动'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'site_timeout',
+                                            'label': '单站点超时（秒）',
+                                            'type': 'number',
+                                            'placeholder': '300，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'run_timeout',
+                                            'label': '全局运行超时（秒）',
+                                            'type': 'number',
+                                            'placeholder': '1800，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'account_concurrency',
+                                            'label': '同站点并发账号数',
+                                            'type': 'number',
+                                            'placeholder': '2'
+                                        }
+                                    }
+                                ]
                             }
                         ]
                     },
                     {
                         'component': 'VRow',
                         'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'progress_notify',
+                                            'label': '逐站点通知',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'progress_interval',
+                                            'label': '逐站点通知间隔（秒）',
+                                            'type': 'number',
+                                            'placeholder': '60，间隔内的结果合并发送'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSwitch',
+                                        'props': {
+                                            'model': 'mp_sites',
+                                            'label': '签到MoviePilot全部站点',
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'http_concurrency',
+                                            'label': '批量签到并发数',
+                                            'type': 'number',
+                                            'placeholder': '8'
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'chips': True,
+                                            'multiple': True,
+                                            'model': 'sites',
+                                            'label': '签到站点',
+                                            'items': site_options
+                                        }
+                                    }
+                                ]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'VRow',
+                        'content': [
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'max_browsers',
+                                            'label': '最大并发浏览器数',
+                                            'type': 'number',
+                                            'placeholder': '1，0为按内存自动'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'stagger_jitter',
+                                            'label': '分组启动随机偏移（秒）',
+                                            'type': 'number',
+                                            'placeholder': '300'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'profile_size',
+                                            'label': '浏览器配置大小上限（MB）',
+                                            'type': 'number',
+                                            'placeholder': '200'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 3
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VSelect',
+                                        'props': {
+                                            'model': 'engine',
+                                            'label': '浏览器引擎',
+                                            'items': [
+                                                {"title": "Selenium", "value": "selenium"},
+                                                {"title": "Playwright", "value": "playwright"},
+                                                {"title": "远程WebDriver", "value": "remote"}
+                                            ]
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'browser_memory',
+                                            'label': '单个浏览器内存上限（MB）',
+                                            'type': 'number',
+                                            'placeholder': '1024，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'browser_lifetime',
+                                            'label': '单个浏览器存活上限（秒）',
+                                            'type': 'number',
+                                            'placeholder': '900，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'min_free_memory',
+                                            'label': '保留可用内存（MB）',
+                                            'type': 'number',
+                                            'placeholder': '512，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'remote_url',
+                                            'label': '远程WebDriver地址',
+                                            'placeholder': 'http://selenium:4444/wd/hub，浏览器引擎为远程WebDriver时使用'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'remote_pool',
+                                            'label': '远程会话池大小',
+                                            'type': 'number',
+                                            'placeholder': '2，不受最大并发浏览器数限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 4
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'asset_cache_size',
+                                            'label': '静态资源缓存大小（MB）',
+                                            'type': 'number',
+                                            'placeholder': '100'
+                                        }
+                                    }
+                                ]
+                            },
                             {
                                 'component': 'VCol',
                                 'props': {
@@ -262,31 +1047,66 @@ class QdSignIn(_PluginBase):
                                 },
                                 'content': [
                                     {
-                                        'component': 'VCronField',
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'host_interval',
+                                            'label': '同一站点请求间隔（秒）',
+                                            'type': 'number',
+                                            'placeholder': '5，0为不限制'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12,
+                                    'md': 6
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextField',
+                                        'props': {
+                                            'model': 'host_burst',
+                                            'label': '同一站点连续请求数',
+                                            'type': 'number',
+                                            'placeholder': '1'
+                                        }
+                                    }
+                                ]
+                            },
+                            {
+                                'component': 'VCol',
+                                'props': {
+                                    'cols': 12
+                                },
+                                'content': [
+                                    {
+                                        'component': 'VTextarea',
                                         'props': {
-                                            'model': 'cron',
-                                            'label': '执行周期',
-                                            'placeholder': '5位cron表达式，留空自动'
+                                            'model': 'site_schedules',
+                                            'label': '站点独立执行周期',
+                                            'placeholder': '每行一组，格式：站点1,站点2|cron表达式 或 站点|开始-结束\n例如：\nhh|0 8 * * *\nou,ttg|09:00-11:00',
+                                            'rows': 3,
+                                            'variant': 'outlined'
                                         }
                                     }
                                 ]
-                            }
-                        ]
-                    },
-                    {
-                        'component': 'VRow',
-                        'content': [
+                            },
                             {
                                 'component': 'VCol',
+                                'props': {
+                                    'cols': 12
+                                },
                                 'content': [
                                     {
-                                        'component': 'VSelect',
+                                        'component': 'VTextarea',
                                         'props': {
-                                            'chips': True,
-                                            'multiple': True,
-                                            'model': 'sites',
-                                            'label': '签到站点',
-                                            'items': site_options
+                                            'model': 'blocked_hosts',
+                                            'label': '轻量模式屏蔽域名',
+                                            'placeholder': '每行一个域名，轻量模式下屏蔽这些域名的请求',
+                                            'rows': 3,
+                                            'variant': 'outlined'
                                         }
                                     }
                                 ]
@@ -352,11 +1172,12 @@ class QdSignIn(_PluginBase):
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VTextarea',
                                         'props': {
                                             'model': 'hh_cookie',
                                             'label': 'HH站点Cookie',
-                                            'placeholder': 'session_id=abc123;user_id=456',
+                                            'rows': 2,
+                                            'placeholder': '每行一个账号：Cookie 或 账号名|Cookie，第一行为默认账号',
                                             'variant': 'outlined'
                                         }
                                     }
@@ -370,11 +1191,12 @@ class QdSignIn(_PluginBase):
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VTextarea',
                                         'props': {
                                             'model': 'ou_cookie',
                                             'label': 'OU站点Cookie',
-                                            'placeholder': 'session_id=abc123;user_id=456',
+                                            'rows': 2,
+                                            'placeholder': '每行一个账号：Cookie 或 账号名|Cookie，第一行为默认账号',
                                             'variant': 'outlined'
                                         }
                                     }
@@ -388,11 +1210,12 @@ class QdSignIn(_PluginBase):
                                 },
                                 'content': [
                                     {
-                                        'component': 'VTextField',
+                                        'component': 'VTextarea',
                                         'props': {
                                             'model': 'ttg_cookie',
                                             'label': 'TTG站点Cookie',
-                                            'placeholder': 'session_id=abc123;user_id=456',
+                                            'rows': 2,
+                                            'placeholder': '每行一个账号：Cookie 或 账号名|Cookie，第一行为默认账号',
                                             'variant': 'outlined'
                                         }
                                     }
@@ -505,7 +1328,7 @@ class QdSignIn(_PluginBase):
                                         'props': {
                                             'type': 'warning',
                                             'variant': 'tonal',
-                                            'text': '自定义站点配置格式：站点名称|域名|Cookie，每行一个站点。请确保Cookie有效且格式正确。'
+                                            'text': '自定义站点配置格式：站点名称|域名|Cookie，每行一个站点，可在末尾追加“|JSON站点配置”指定签到步骤和结果关键字。请确保Cookie有效且格式正确。'
                                         }
                                     }
                                 ]
@@ -523,15 +1346,109 @@ class QdSignIn(_PluginBase):
             "custom_sites": "",
             "hh_cookie": "",
             "ou_cookie": "",
-            "ttg_cookie": ""
+            "ttg_cookie": "",
+            "site_timeout": 300,
+            "run_timeout": 1800,
+            "site_schedules": "",
+            "max_browsers": 1,
+            "stagger_jitter": 300,
+            "persist_profile": False,
+            "profile_size": 200,
+            "lean_mode": False,
+            "engine": "selenium",
+            "blocked_hosts": "\n".join(DEFAULT_BLOCKED_HOSTS),
+            "progress_notify": False,
+            "progress_interval": 60,
+            "mp_sites": False,
+            "http_concurrency": 8,
+            "account_concurrency": 2,
+            "browser_memory": 1024,
+            "browser_lifetime": 900,
+            "min_free_memory": 512,
+            "remote_url": "",
+            "remote_pool": 2,
+            "asset_cache": False,
+            "asset_cache_size": 100,
+            "host_interval": 5,
+            "host_burst": 1
         }
 
     def get_page(self) -> List[dict]:
         """
         拼装插件详情页面，需要返回页面配置，同时附带数据
         """
-        # 获取签到历史数据
-        history_data = self.get_data("signin_history") or {}
+        # 签到历史未变化时直接返回缓存
+        if not self._page_cache or self._page_cache[0] != self._history_version:
+            self._page_cache = (self._history_version, self.__build_page())
+        return self._page_cache[1]
+
+    def __build_page(self) -> List[dict]:
+        """
+        根据各站点最近一次签到结果构建详情页面
+        """
+        summary = self.__get_site_summary()
+
+        rows = []
+        for site, item in sorted(summary.items(), key=lambda x: (x[1].get("date", ""), x[1].get("time", "")),
+                                 reverse=True):
+            rows.append({
+                'component': 'tr',
+                'content': [
+                    {'component': 'td', 'text': site},
+                    {'component': 'td', 'text': f"{item.get('date', '')} {item.get('time', '')}"},
+                    {
+                        'component': 'td',
+                        'content': [
+                            {
+                                'component': 'VChip',
+                                'props': {
+                                    'size': 'small',
+                                    'variant': 'tonal',
+                                    'color': 'success' if item.get('success') else 'error'
+                                },
+                                'text': '成功' if item.get('success') else '失败'
+                            }
+                        ]
+                    },
+                    {'component': 'td', 'text': f"{item.get('duration', 0):.0f} 秒"},
+                    {'component': 'td', 'text': item.get('message', '')}
+                ]
+            })
+
+        content = [
+            {
+                'component': 'VAlert',
+                'props': {
+                    'type': 'info',
+                    'text': '暂无签到记录' if not summary else f'共有 {len(summary)} 个站点的签到记录',
+                    'variant': 'tonal'
+                }
+            }
+        ]
+        if rows:
+            content.append({
+                'component': 'VTable',
+                'props': {
+                    'hover': True,
+                    'density': 'compact'
+                },
+                'content': [
+                    {
+                        'component': 'thead',
+                        'content': [
+                            {
+                                'component': 'tr',
+                                'content': [{'component': 'th', 'text': title}
+                                            for title in ['站点', '最近签到', '状态', '耗时', '结果']]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'tbody',
+                        'content': rows
+                    }
+                ]
+            })
 
         # 构建页面内容
         page_content = [
@@ -564,80 +1481,721 @@ class QdSignIn(_PluginBase):
                     },
                     {
                         'component': 'VCardText',
+                        'content': content
+                    }
+                ]
+            }
+        ]
+
+        return page_content
+
+    def __get_site_summary(self) -> Dict[str, dict]:
+        """
+        各站点最近一次签到结果，签到时增量维护；没有汇总数据时从签到历史生成一次
+        """
+        if self._site_summary is None:
+            summary = self.get_data("site_summary")
+            if summary is None:
+                summary = {}
+                history = self.get_data("signin_history") or {}
+                for date in sorted(history):
+                    for site, item in history[date].items():
+                        summary[site] = self.__summary_entry(summary.get(site), item, date)
+                self.save_data("site_summary", summary)
+            self._site_summary = summary
+        return self._site_summary
+
+    @staticmethod
+    def __summary_entry(previous: Optional[dict], entry: dict, date: str) -> dict:
+        """
+        站点汇总项：最近结果和连续成功天数，同一天多次成功只计一次，中断一天后重新计数
+        """
+        previous = previous or {}
+        success_date = previous.get("success_date") or (previous.get("date") if previous.get("success") else None)
+        streak = 0
+        if entry.get("success"):
+            yesterday = (datetime.strptime(date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+            if success_date == date:
+                streak = max(previous.get("streak", 0), 1)
+            elif success_date == yesterday:
+                streak = previous.get("streak", 0) + 1
+            else:
+                streak = 1
+            success_date = date
+        return {**entry, "date": date, "streak": streak, "success_date": success_date}
+
+    def __get_last_run(self) -> Optional[dict]:
+        """
+        最近一次运行的耗时指标
+        """
+        if self._last_run is None:
+            reports = self.get_data("run_reports") or []
+            self._last_run = reports[-1] if reports else {}
+        return self._last_run
+
+    def get_dashboard_meta(self) -> Optional[List[Dict[str, str]]]:
+        """
+        获取插件仪表盘元信息
+        """
+        return [{
+            "key": "signin",
+            "name": "站点签到"
+        }]
+
+    def get_dashboard(self, key: str = None, **kwargs) -> Optional[Tuple[Dict[str, Any], Dict[str, Any], List[dict]]]:
+        """
+        获取插件仪表盘页面，数据来自增量维护的站点汇总和最近一次运行指标
+        """
+        # 今日状态随日期变化，缓存同时按日期区分
+        version = (self._history_version, datetime.now().strftime("%Y-%m-%d"))
+        if not self._dashboard_cache or self._dashboard_cache[0] != version:
+            self._dashboard_cache = (version, self.__build_dashboard())
+        return {
+            "cols": 12,
+            "md": 6
+        }, {
+            "refresh": 60,
+            "border": True,
+            "title": "站点签到",
+            "subtitle": "今日签到状态"
+        }, self._dashboard_cache[1]
+
+    def __build_dashboard(self) -> List[dict]:
+        """
+        构建仪表盘：最近一次运行、今日各站点状态、连续成功天数和耗时最长的站点
+        """
+        summary = self.__get_site_summary()
+        last_run = self.__get_last_run()
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        if last_run:
+            run_text = (f"最近运行 {last_run.get('start', '')}，"
+                        f"成功 {last_run.get('success', 0)}/{last_run.get('sites', 0)}，"
+                        f"耗时 {last_run.get('makespan', 0):.0f} 秒")
+        else:
+            run_text = "暂无运行记录"
+
+        rows = []
+        for site, item in sorted(summary.items()):
+            signed = item.get("date") == today
+            if not signed:
+                status, color = "未签到", "grey"
+            elif item.get("success"):
+                status, color = "成功", "success"
+            else:
+                status, color = "失败", "error"
+            rows.append({
+                'component': 'tr',
+                'content': [
+                    {'component': 'td', 'text': site},
+                    {
+                        'component': 'td',
                         'content': [
                             {
-                                'component': 'VAlert',
+                                'component': 'VChip',
                                 'props': {
-                                    'type': 'info',
-                                    'text': '暂无签到记录' if not history_data else f'共有 {len(history_data)} 条签到记录',
-                                    'variant': 'tonal'
-                                }
+                                    'size': 'small',
+                                    'variant': 'tonal',
+                                    'color': color
+                                },
+                                'text': status
                             }
                         ]
-                    }
+                    },
+                    {'component': 'td', 'text': item.get("time", "") if signed else ""},
+                    {'component': 'td', 'text': f"{item.get('streak', 0)} 天"}
                 ]
+            })
+
+        slowest = sorted(summary.items(), key=lambda x: x[1].get("duration", 0), reverse=True)[:3]
+        slowest_text = "，".join(f"{site} {item.get('duration', 0):.0f} 秒" for site, item in slowest
+                                if item.get("duration"))
+
+        elements = [
+            {
+                'component': 'div',
+                'props': {
+                    'class': 'text-body-2 mb-2'
+                },
+                'text': run_text
             }
         ]
-
-        return page_content
+        if rows:
+            elements.append({
+                'component': 'VTable',
+                'props': {
+                    'hover': True,
+                    'density': 'compact'
+                },
+                'content': [
+                    {
+                        'component': 'thead',
+                        'content': [
+                            {
+                                'component': 'tr',
+                                'content': [{'component': 'th', 'text': title}
+                                            for title in ['站点', '今日状态', '签到时间', '连续成功']]
+                            }
+                        ]
+                    },
+                    {
+                        'component': 'tbody',
+                        'content': rows
+                    }
+                ]
+            })
+        if slowest_text:
+            elements.append({
+                'component': 'div',
+                'props': {
+                    'class': 'text-caption mt-2'
+                },
+                'text': f"耗时最长：{slowest_text}"
+            })
+        return elements
 
     def signin_api(self):
         """
         API接口：执行签到
         """
         try:
-            self.sign_in()
+            if self._progress_runs:
+                return {"success": False, "message": "签到正在进行中"}
+            # 后台执行，通过进度接口查询结果
+            Thread(target=self.sign_in, daemon=True).start()
             return {"success": True, "message": "签到任务已启动"}
         except Exception as e:
             logger.error(f"API签到失败：{str(e)}")
             return {"success": False, "message": f"签到失败：{str(e)}"}
 
-    def sign_in(self):
+    def progress_api(self):
         """
-        执行签到操作
+        API接口：正在进行的签到运行进度，以及最近一次完成的运行结果
         """
-        # 获取所有需要签到的站点
-        all_sites = []
+        return {
+            "running": [progress.snapshot() for progress in (self._progress_runs or {}).values()],
+            "last": self._last_progress.snapshot() if self._last_progress else None
+        }
 
-        # 添加预设站点
-        if self._sites:
-            all_sites.extend(self._sites)
+    def action_signin(self, action_content: schemas.ActionContent, sites: List[str] = None,
+                      unsigned: bool = False, from_content: bool = False) -> Tuple[bool, schemas.ActionContent]:
+        """
+        工作流动作：签到指定站点，浏览器数量受最大并发浏览器数限制
+        :param sites: 指定签到的站点
+        :param unsigned: 只签到今日尚未成功的站点
+        :param from_content: 签到工作流上下文中的站点
+        """
+        targets = self._get_all_sites()
+        if sites is not None:
+            targets = [site for site in targets if site in sites]
+        if from_content:
+            targets = self.__match_content_sites(targets, action_content.sites or [])
+        if unsigned:
+            today = datetime.now().strftime("%Y-%m-%d")
+            summary = self.__get_site_summary()
+            targets = [site for site in targets
+                       if not (summary.get(site, {}).get("date") == today and summary[site].get("success"))]
+
+        if not targets:
+            self.__add_action_message(action_content, "站点签到", "没有需要签到的站点")
+            return True, action_content
+
+        results = self.sign_in(targets)
+        if results is None:
+            self.__add_action_message(action_content, "站点签到", "签到正在进行中，本次未执行")
+            return False, action_content
+        for site, result in results.items():
+            self.__add_action_message(action_content, f"{site} 签到{'成功' if result.get('success') else '失败'}",
+                                      result.get("message", ""))
+        return all(result.get("success") for result in results.values()), action_content
+
+    def action_probe_cookies(self, action_content: schemas.ActionContent) -> Tuple[bool, schemas.ActionContent]:
+        """
+        工作流动作：通过HTTP请求检测各站点Cookie是否有效，不启动浏览器
+        """
+        results = self.probe_cookies(self._get_all_sites())
+        for site, result in results.items():
+            self.__add_action_message(action_content, f"{site} Cookie{'有效' if result.get('success') else '无效'}",
+                                      result.get("message", ""))
+        return all(result.get("success") for result in results.values()), action_content
 
-        # 添加自定义站点
-        custom_sites = self._parse_custom_sites()
-        if custom_sites:
-            all_sites.extend([site['name'] for site in custom_sites])
+    @staticmethod
+    def __add_action_message(action_content: schemas.ActionContent, title: str, text: str):
+        """
+        将结果写入工作流上下文的消息列表
+        """
+        if action_content.messages is None:
+            action_content.messages = []
+        action_content.messages.append(schemas.Notification(title=title, text=text))
 
-        if not all_sites:
-            logger.warning("未配置任何签到站点")
-            return
+    def __match_content_sites(self, targets: List[str], content_sites: list) -> List[str]:
+        """
+        按名称或域名匹配工作流上下文中的站点
+        """
+        matched = []
+        for site in targets:
+            domain = self._get_site_url(site).split("://")[-1].strip("/")
+            for content_site in content_sites:
+                names = [getattr(content_site, "name", None), getattr(content_site, "domain", None),
+                         getattr(content_site, "url", None)]
+                if any(name and (site.lower() == name.lower() or (domain and domain in name)) for name in names):
+                    matched.append(site)
+                    break
+        return matched
+
+    def _get_site_url(self, site: str) -> str:
+        """
+        站点首页地址
+        """
+        if site in PRESET_SITES:
+            return f"https://{PRESET_SITES[site]}/"
+        for custom_site in self._parse_custom_sites():
+            if custom_site['name'] == site:
+                domain = custom_site['domain']
+                return domain if domain.startswith("http") else f"https://{domain}/"
+        mp_site = self._get_mp_sites().get(site)
+        if mp_site:
+            return mp_site["url"]
+        return ""
+
+    def probe_cookies(self, sites: List[str]) -> Dict[str, dict]:
+        """
+        检测站点Cookie是否有效：访问首页后未跳转到登录页且页面包含退出链接
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from app.utils.http import RequestUtils
+
+        custom_cookies = {custom_site['name']: custom_site['cookie'] for custom_site in self._parse_custom_sites()}
+        mp_cookies = {site: config["cookie"] for site, config in self._get_mp_sites().items()}
+
+        def _probe(site: str) -> dict:
+            url = self._get_site_url(site)
+            cookie = custom_cookies.get(site) or (self._get_site_cookie(site, PRESET_SITES[site])
+                                                 if site in PRESET_SITES else mp_cookies.get(site, ""))
+            if not url or not cookie:
+                return {"success": False, "message": "未找到站点地址或Cookie配置"}
+            host_limiter.acquire(url)
+            res = RequestUtils(cookies=cookie, ua=settings.USER_AGENT, timeout=20).get_res(url)
+            if res is None:
+                return {"success": False, "message": "无法访问站点"}
+            if res.status_code != 200 or "login" in res.url:
+                return {"success": False, "message": f"Cookie已失效（HTTP {res.status_code}）"}
+            if "logout" not in res.text:
+                return {"success": False, "message": "页面未包含登录状态"}
+            return {"success": True, "message": "Cookie有效"}
+
+        if not sites:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(len(sites), 4)) as executor:
+            return dict(zip(sites, executor.map(_probe, sites)))
+
+    def sign_in(self, sites: List[str] = None, resume: str = None) -> Optional[Dict[str, dict]]:
+        """
+        执行签到操作，已有签到运行时跳过本次；继续中断的运行时等待当前运行结束
+        :param sites: 指定签到的站点，为空时签到所有站点
+        :param resume: 继续指定的中断运行，只签到其中未完成的站点
+        :return: 各站点签到结果，因已有签到运行而跳过时返回None
+        """
+        if resume:
+            acquired = self._run_lock.acquire(timeout=max(self._run_timeout, 60))
+        else:
+            acquired = self._run_lock.acquire(blocking=False)
+        if not acquired:
+            logger.warning(f"已有签到运行正在进行，跳过本次签到"
+                           f"{'：' + ', '.join(sites) if sites else ''}")
+            return None
+        try:
+            return self.__sign_in(sites, resume)
+        finally:
+            self._run_lock.release()
 
-        logger.info("开始执行站点签到...")
+    def __sign_in(self, sites: List[str] = None, resume: str = None) -> Dict[str, dict]:
+        """
+        执行一次签到运行
+        """
+        checkpoints = self.__get_checkpoints()
+        all_sites = self._get_all_sites()
         results = {}
+        checkpoint = checkpoints.get(resume) if resume else None
+        if resume and not checkpoint:
+            logger.info(f"签到运行 {resume} 已完成或已过期，无需继续")
+            return {}
+        if checkpoint:
+            # 已完成的结果并入本次结果，只签到剩余的站点和账号
+            all_sites = [site for site in checkpoint["sites"]
+                         if site in all_sites and site not in checkpoint["done"]]
+            results = dict(checkpoint["results"])
+        elif sites is not None:
+            all_sites = [site for site in all_sites if site in sites]
 
-        for site in all_sites:
-            try:
-                logger.info(f"开始签到站点：{site}")
-                result = self._signin_site(site)
+        if not all_sites:
+            if checkpoint:
+                checkpoints.finish(resume)
+            else:
+                logger.warning("未配置任何签到站点")
+            return results
+
+        # 按历史耗时和成功率排序，快速站点优先出结果
+        stats = SiteStats(self.get_data("site_stats"))
+        if not checkpoint:
+            all_sites = stats.order(all_sites)
+
+        if checkpoint:
+            logger.info(f"继续签到运行 {resume}，已完成 {len(checkpoint['done'])} 个站点，"
+                        f"剩余站点：{', '.join(all_sites)}")
+        else:
+            logger.info(f"开始执行站点签到，执行顺序：{', '.join(all_sites)}")
+        # 进度按账号统计，已有结果的账号不再计入
+        progress = RunProgress([key for key in self._get_site_keys(all_sites) if key not in results],
+                               run_id=resume)
+        if not checkpoint:
+            checkpoints.start(progress.run_id, all_sites)
+        if self._progress_runs is None:
+            self._progress_runs = {}
+        self._progress_runs[progress.run_id] = progress
+        notifier = None
+        if self._notify and self._progress_notify:
+            notifier = ProgressNotifier(self.__send_progress_message, self._progress_interval)
+        context = None
+        try:
+            selectors = SelectorCache(self.get_data("selector_hits"))
+            report = RunReport()
+            report.init_ms = self._init_ms
+            display_before = virtual_display.snapshot()
+            cache_before = asset_cache.snapshot()
+            profiles = None
+            if self._persist_profile:
+                profiles = self.__get_profiles()
+                # 每个账号使用独立的配置目录，按账号保留
+                profiles.cleanup(self._get_site_keys(self._get_all_sites()))
+            context = RunContext(token=self._cancel_token,
+                                 run_timeout=self._run_timeout,
+                                 site_timeout=self._site_timeout,
+                                 profiles=profiles,
+                                 lean=self._lean_mode,
+                                 blocked_hosts=[host.strip() for host in self._blocked_hosts.split("\n")
+                                                if host.strip()],
+                                 engine=create_engine(self._engine, self._remote_url, self._remote_pool),
+                                 asset_cache=self._asset_cache,
+                                 selectors=selectors)
+
+            def _record(site: str, result: dict, duration: float):
+                """记录站点签到结果"""
                 results[site] = result
+                if not context.token.cancelled:
+                    # 被中止的站点不写入检查点，重启后重新签到
+                    checkpoints.record(progress.run_id, site, result)
+                    stats.record(site, duration, result.get("success", False))
+                    stats.record_load(site, result.get("metrics"))
+                    load_summary = stats.load_summary(site)
+                    if load_summary:
+                        logger.info(f"站点 {site} 平均加载指标：{load_summary}")
+                report.site_done(result.get("success", False))
+                self._save_signin_result(site, result, duration)
+                self.__site_progress(progress, notifier, site, result, duration)
+
+            # MoviePilot中的NexusPHP站点先通过HTTP并发签到，其余站点使用浏览器签到
+            browser_sites = all_sites
+            mp_sites = {site: config for site, config in self._get_mp_sites().items() if site in all_sites}
+            if mp_sites:
+                fallback = self.__signin_mp_batch(mp_sites, context, _record)
+                browser_sites = [site for site in all_sites if site not in mp_sites or site in fallback]
+                if not context.token.cancelled:
+                    for site in mp_sites:
+                        if site not in fallback:
+                            checkpoints.site_done(progress.run_id, site)
+
+            # 检查点中已有结果的账号不再签到
+            skip = dict(results)
+
+            def _browser_site(site: str) -> Tuple[Optional[Dict[str, dict]], float, Optional[Exception]]:
+                """签到站点的全部账号，返回各账号结果、耗时和异常，运行已中止时结果为None"""
+                if context.token.cancelled or context.run_expired():
+                    return None, 0, None
+                site_start = time.monotonic()
+                try:
+                    logger.info(f"开始签到站点：{site}")
+                    progress.begin_site(site)
+                    # 每个站点使用独立的站点截止时间
+                    site_context = copy.copy(context)
+                    site_context.begin_site()
+                    return self._signin_site_accounts(site, site_context, skip=skip), \
+                        time.monotonic() - site_start, None
+                except Exception as e:
+                    return {}, time.monotonic() - site_start, e
+
+            def _browser_site_done(site: str, site_results: Optional[Dict[str, dict]], duration: float,
+                                   error: Optional[Exception]):
+                """在签到线程中记录站点结果，避免并发写入插件数据"""
+                if site_results is None:
+                    reason = context.token.reason if context.token.cancelled else "已超出全局运行时间"
+                    logger.warning(f"站点 {site} 未执行：{reason}")
+                    for key in self._get_site_keys([site]):
+                        if key not in results:
+                            results[key] = {"success": False, "message": f"签到中止：{reason}"}
+                            progress.site_done(key, results[key])
+                    return
+                if error:
+                    error_msg = f"签到失败：{str(error)}"
+                    logger.error(f"站点 {site} {error_msg}")
+                    report.site_done()
+                    results[site] = {"success": False, "message": error_msg}
+                    if not context.token.cancelled:
+                        checkpoints.record(progress.run_id, site, results[site])
+                        checkpoints.site_done(progress.run_id, site)
+                    self._save_signin_result(site, results[site], duration)
+                    self.__site_progress(progress, notifier, site, results[site], duration)
+                    return
+                for key, result in site_results.items():
+                    _record(key, result, duration)
+                if not context.token.cancelled:
+                    checkpoints.site_done(progress.run_id, site)
+
+            workers = self.__browser_workers(context.engine, len(browser_sites))
+            if workers <= 1:
+                for site in browser_sites:
+                    _browser_site_done(site, *_browser_site(site))
+            else:
+                from concurrent.futures import ThreadPoolExecutor, as_completed
+
+                # 同时签到的站点数按浏览器并发上限确定，实际启动浏览器前仍需通过内存准入
+                logger.info(f"同时签到 {workers} 个浏览器站点")
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    futures = {executor.submit(_browser_site, site): site for site in browser_sites}
+                    for future in as_completed(futures):
+                        _browser_site_done(futures[future], *future.result())
+        finally:
+            # 运行异常退出时同样关闭浏览器和HTTP会话，并移除进行中的运行
+            if context:
+                context.engine.close()
+                if context.http_session:
+                    context.http_session.close()
+            progress.finish()
+            self._progress_runs.pop(progress.run_id, None)
+            self._last_progress = progress
+            if notifier:
+                notifier.close()
+
+        # 结束本次运行中未正常退出的浏览器进程
+        report.reaped = len(browser_reaper.reap())
+        if report.reaped:
+            logger.warning(f"运行结束时结束了 {report.reaped} 个残留浏览器进程")
+        report.finish()
+        # 正常结束（包括超出全局运行时间）后删除检查点，被中止的运行保留检查点等待继续
+        if not context.token.cancelled:
+            checkpoints.finish(progress.run_id)
+        report.record_display(display_before, virtual_display.snapshot())
+        cache_after = asset_cache.snapshot()
+        if cache_after["hits"] > cache_before["hits"]:
+            logger.info(f"静态资源缓存命中 {cache_after['hits'] - cache_before['hits']} 次，"
+                        f"节省 {(cache_after['saved_bytes'] - cache_before['saved_bytes']) / 1024:.1f} KB，"
+                        f"当前缓存 {cache_after['entries']} 个资源（{cache_after['size'] / 1024 / 1024:.1f} MB）")
+        if report.display:
+            logger.info(f"虚拟显示启动 {report.display['starts']} 次（{report.display['startup_ms']} ms），"
+                        f"复用 {report.display['reuses']} 次")
+        self.save_data("site_stats", stats.data)
+        self.save_data("selector_hits", selectors.data)
+        if self._fingerprints:
+            self.save_data("site_fingerprints", self._fingerprints.data)
+        self._save_run_report(report)
+
+        # 发送通知
+        if self._notify:
+            self._send_notification(results, report)
+
+        logger.info(f"站点签到完成，首个结果耗时 {report.first_result or 0:.1f} 秒，"
+                    f"总耗时 {report.finished:.1f} 秒")
+        return results
+
+    def __browser_workers(self, engine, sites: int) -> int:
+        """
+        同时签到的浏览器站点数：本机浏览器取最大并发浏览器数，为0时按主机内存和CPU数自动确定；
+        远程浏览器取会话池大小；浏览器绑定线程的引擎逐个签到
+        """
+        if not sites or (engine and not engine.thread_safe):
+            return 1
+        if engine and not engine.local:
+            return min(self._remote_pool, sites)
+        return min(browser_slots.limit, sites)
+
+    def __signin_mp_batch(self, mp_sites: Dict[str, dict], context: RunContext, record) -> List[str]:
+        """
+        以有限并发通过HTTP签到MoviePilot中的NexusPHP站点，返回需要使用浏览器签到的站点
+        """
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        concurrency = max(self._http_concurrency, 1)
+        context.http_session = create_http_session(concurrency)
+        logger.info(f"开始批量签到 {len(mp_sites)} 个MoviePilot站点，并发数 {concurrency}")
+
+        def _task(site: str):
+            start = time.monotonic()
+            # 每个站点使用独立的站点截止时间
+            site_context = copy.copy(context)
+            site_context.begin_site()
+            return self._signin_mp_site(mp_sites[site], site_context, browser=False), time.monotonic() - start
+
+        fallback = []
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = {executor.submit(_task, site): site for site in mp_sites}
+            for future in as_completed(futures):
+                site = futures[future]
+                try:
+                    result, duration = future.result()
+                except Exception as e:
+                    result, duration = {"success": False, "message": f"签到失败：{str(e)}"}, 0
+                if result is None:
+                    fallback.append(site)
+                    continue
+                record(site, result, duration)
+        if fallback:
+            logger.info(f"以下站点不支持HTTP签到，使用浏览器签到：{', '.join(fallback)}")
+        return fallback
 
-                # 记录签到结果
-                self._save_signin_result(site, result)
+    def _get_mp_sites(self) -> Dict[str, dict]:
+        """
+        MoviePilot中已启用且配置了Cookie的站点，排除预设站点和自定义站点
+        """
+        if not self._mp_sites:
+            return {}
+        try:
+            from app.db.site_oper import SiteOper
 
-                # 等待一段时间避免频繁请求
-                time.sleep(5)
+            # 按主机名比较，自定义站点地址可能带有路径或省略协议
+            taken = {host_limiter.host(url) for url in list(PRESET_SITES.values())
+                     + [site['domain'] for site in self._parse_custom_sites()]}
+            mp_sites = {}
+            for site in SiteOper().list():
+                if not site.is_active or not site.cookie or not site.url:
+                    continue
+                if host_limiter.host(site.url) in taken:
+                    continue
+                mp_sites[site.name] = {
+                    "name": site.name,
+                    "url": site.url,
+                    "domain": site.domain or site.url,
+                    "cookie": site.cookie,
+                    "ua": site.ua,
+                    "proxy": bool(site.proxy)
+                }
+            return mp_sites
+        except Exception as e:
+            logger.error(f"获取MoviePilot站点失败：{str(e)}")
+            return {}
 
+    def _signin_mp_site(self, site_config: dict, context: RunContext = None, browser: bool = True) -> Optional[dict]:
+        """
+        MoviePilot站点签到：NexusPHP站点直接请求attendance.php，其余站点使用浏览器；
+        browser为False且需要浏览器时返回None
+        """
+        from .sites.profile_signin import ProfileSignin
+
+        name = site_config["name"]
+        proxies = settings.PROXY if site_config.get("proxy") else None
+        if self._fingerprints is None:
+            self._fingerprints = FingerprintCache(self.get_data("site_fingerprints"))
+        site_fingerprint = self._fingerprints.get(site_config["domain"])
+        if site_fingerprint is None:
+            try:
+                host_limiter.acquire(site_config["url"], context)
+                site_fingerprint = fingerprint(site_config["url"], site_config["cookie"],
+                                               ua=site_config.get("ua") or settings.USER_AGENT, proxies=proxies,
+                                               session=context.http_session if context else None,
+                                               timeout=context.bounded(30) if context else 30)
             except Exception as e:
-                error_msg = f"签到失败：{str(e)}"
-                logger.error(f"站点 {site} {error_msg}")
-                results[site] = {"success": False, "message": error_msg}
-                self._save_signin_result(site, {"success": False, "message": error_msg})
+                return {"success": False, "message": f"签到失败：{str(e)}"}
+            if site_fingerprint.get("login"):
+                return {"success": False, "message": "Cookie已失效，需要重新登录"}
+            self._fingerprints.set(site_config["domain"], site_fingerprint)
+            logger.info(f"站点 {name} 识别结果：{'NexusPHP' if site_fingerprint.get('nexusphp') else '其它'}，"
+                        f"{'支持' if site_fingerprint.get('attendance') else '不支持'}attendance.php签到")
+
+        if site_fingerprint.get("attendance"):
+            profile = compile_profile({**NEXUS_PROFILE, "name": name, "url": site_config["url"]})
+        elif not browser:
+            return None
+        else:
+            profile = custom_profile(name, site_config["url"])
+        handler = ProfileSignin(profile, site_config["cookie"], context)
+        handler.ua = site_config.get("ua")
+        handler.proxies = proxies
+        return handler.signin()
+
+    def __site_progress(self, progress: RunProgress, notifier: Optional[ProgressNotifier],
+                        site: str, result: dict, duration: float):
+        """
+        站点完成后更新进度、发送站点完成事件和增量通知
+        """
+        progress.site_done(site, result, duration)
+        try:
+            eventmanager.send_event(EventType.PluginTriggered, {
+                "plugin_id": self.__class__.__name__,
+                "event_name": "site_signed",
+                "run_id": progress.run_id,
+                "site": site,
+                "success": result.get("success", False),
+                "message": result.get("message", ""),
+                "duration": round(duration, 2)
+            })
+        except Exception as e:
+            logger.debug(f"发送站点完成事件失败：{str(e)}")
+        if notifier:
+            notifier.add(site, result)
 
-        # 发送通知
-        if self._notify:
-            self._send_notification(results)
+    def __send_progress_message(self, message: str):
+        """
+        发送增量通知
+        """
+        try:
+            self.systemmessage.put(message, title="站点签到进度")
+        except Exception as e:
+            logger.error(f"发送进度通知失败：{str(e)}")
+
+    def _get_all_sites(self) -> List[str]:
+        """
+        获取所有需要签到的站点
+        """
+        all_sites = []
+
+        # 添加预设站点
+        if self._sites:
+            all_sites.extend(self._sites)
+
+        # 添加自定义站点，同一站点的多个账号只添加一次
+        custom_sites = self._parse_custom_sites()
+        for site in custom_sites:
+            if site['name'] not in all_sites:
+                all_sites.append(site['name'])
 
-        logger.info("站点签到完成")
+        # 添加MoviePilot站点
+        all_sites.extend([site for site in self._get_mp_sites() if site not in all_sites])
+
+        return all_sites
+
+    def _parse_site_schedules(self) -> Dict[str, str]:
+        """
+        解析站点独立执行周期，格式：站点1,站点2|cron表达式 或 站点|HH:MM-HH:MM
+        """
+        site_schedules = {}
+        if not self._site_schedules:
+            return site_schedules
+
+        all_sites = self._get_all_sites()
+        for line in self._site_schedules.strip().split('\n'):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split('|', 1)
+            if len(parts) != 2 or not parts[1].strip():
+                logger.warning(f"站点执行周期配置格式错误：{line}")
+                continue
+            for site in parts[0].split(','):
+                site = site.strip()
+                if site not in all_sites:
+                    logger.warning(f"站点执行周期配置中的站点未启用：{site}")
+                    continue
+                site_schedules[site] = parts[1].strip()
+        return site_schedules
 
     def _parse_custom_sites(self) -> list:
         """
@@ -654,15 +2212,29 @@ class QdSignIn(_PluginBase):
                 if not line or line.startswith('#'):
                     continue
 
-                parts = line.split('|')
+                # 第4段为可选的JSON站点配置，其中的XPath可能包含"|"
+                parts = line.split('|', 3)
                 if len(parts) >= 3:
+                    # 站点名称@账号名 表示同一站点的其它账号
+                    name, _, account = parts[0].strip().partition('@')
+                    name = name.strip()
+                    account = account.strip()
+                    accounts = [site.get('account', '') for site in custom_sites if site['name'] == name]
+                    if account in accounts:
+                        account = f"账号{len(accounts) + 1}"
                     site_config = {
-                        'name': parts[0].strip(),
+                        'name': name,
+                        'account': account,
                         'domain': parts[1].strip(),
                         'cookie': parts[2].strip()
                     }
+                    if len(parts) == 4 and parts[3].strip():
+                        try:
+                            site_config['profile'] = json.loads(parts[3])
+                        except ValueError as err:
+                            logger.warning(f"自定义站点 {site_config['name']} 的站点配置不是有效的JSON：{str(err)}")
                     custom_sites.append(site_config)
-                    logger.info(f"解析自定义站点配置：{site_config['name']} - {site_config['domain']}")
+                    logger.debug(f"解析自定义站点配置：{site_config['name']} - {site_config['domain']}")
                 else:
                     logger.warning(f"自定义站点配置格式错误：{line}")
         except Exception as e:
@@ -695,7 +2267,7 @@ class QdSignIn(_PluginBase):
                 return target_site.cookie
 
             # 如果MP中没有找到，使用手动填写的cookie
-            manual_cookie = self._manual_cookies.get(site_name.lower())
+            manual_cookie = self.__default_manual_cookie(site_name)
             if manual_cookie:
                 logger.info(f"使用手动配置的 {site_name} Cookie")
                 return manual_cookie
@@ -706,45 +2278,175 @@ class QdSignIn(_PluginBase):
         except Exception as e:
             logger.error(f"获取站点Cookie失败：{str(e)}")
             # 降级使用手动填写的cookie
-            manual_cookie = self._manual_cookies.get(site_name.lower())
+            manual_cookie = self.__default_manual_cookie(site_name)
             if manual_cookie:
                 logger.info(f"降级使用手动配置的 {site_name} Cookie")
                 return manual_cookie
             return ""
 
-    def _signin_site(self, site: str) -> dict:
+    def __manual_accounts(self, site_name: str) -> List[Tuple[str, str]]:
+        """
+        手动填写的站点账号，每行一个，格式：Cookie 或 账号名|Cookie，第一行为默认账号
+        """
+        accounts = []
+        for line in (self._manual_cookies.get(site_name.lower()) or "").split("\n"):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            account, _, cookie = line.partition('|') if '|' in line else ("", "", line)
+            account = account.strip() if accounts else ""
+            if accounts and (not account or account in dict(accounts)):
+                account = f"账号{len(accounts) + 1}"
+            accounts.append((account, cookie.strip()))
+        return accounts
+
+    def __default_manual_cookie(self, site_name: str) -> str:
+        accounts = self.__manual_accounts(site_name)
+        return accounts[0][1] if accounts else ""
+
+    def _get_site_accounts(self, site: str) -> List[str]:
+        """
+        站点的账号列表，默认账号为空字符串
+        """
+        custom_accounts = [custom_site.get('account', '') for custom_site in self._parse_custom_sites()
+                           if custom_site['name'] == site]
+        if custom_accounts:
+            return custom_accounts
+        if site in BUILTIN_PROFILES:
+            return [""] + [account for account, _ in self.__manual_accounts(site)[1:]]
+        return [""]
+
+    @staticmethod
+    def _result_key(site: str, account: str = "") -> str:
+        """
+        签到结果和历史记录的键：默认账号为站点名，其它账号为 站点名@账号名
+        """
+        return f"{site}@{account}" if account else site
+
+    def _get_site_keys(self, sites: List[str]) -> List[str]:
+        """
+        站点全部账号的结果键，也对应各账号的浏览器配置目录
+        """
+        return [self._result_key(site, account) for site in sites for account in self._get_site_accounts(site)]
+
+    def _signin_site_accounts(self, site: str, context: RunContext, skip: Dict[str, dict] = None) -> Dict[str, dict]:
+        """
+        签到站点的全部账号，每个账号使用独立的浏览器会话并行执行，
+        同时进行的账号数受同站点并发账号数和最大并发浏览器数限制
+        :param skip: 已有结果的站点或账号，不再签到
+        """
+        accounts = [account for account in self._get_site_accounts(site)
+                    if self._result_key(site, account) not in (skip or {})]
+        if not accounts:
+            return {}
+        workers = min(len(accounts), self._account_concurrency)
+        if context.engine and not context.engine.thread_safe:
+            # 浏览器绑定创建它的线程，全部账号在当前线程依次签到
+            workers = 1
+        if len(accounts) > 1:
+            logger.info(f"站点 {site} 共 {len(accounts)} 个账号，同时签到 {workers} 个")
+
+        def _signin_account(account: str) -> dict:
+            """每个账号使用独立的截止时间，从账号实际开始签到时计算"""
+            account_context = copy.copy(context)
+            account_context.begin_site()
+            return self._signin_site(site, account_context, account)
+
+        results = {}
+        if workers <= 1:
+            for account in accounts:
+                key = self._result_key(site, account)
+                try:
+                    results[key] = _signin_account(account)
+                except Exception as e:
+                    logger.error(f"站点 {key} 签到失败：{str(e)}")
+                    results[key] = {"success": False, "message": f"签到失败：{str(e)}"}
+            return results
+
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_signin_account, account): account for account in accounts}
+            for future in as_completed(futures):
+                key = self._result_key(site, futures[future])
+                try:
+                    results[key] = future.result()
+                except Exception as e:
+                    logger.error(f"站点 {key} 签到失败：{str(e)}")
+                    results[key] = {"success": False, "message": f"签到失败：{str(e)}"}
+        return results
+
+    def _signin_site(self, site: str, context: RunContext = None, account: str = "") -> dict:
         """
-        执行单个站点签到
+        执行单个站点单个账号的签到
         """
         # 检查是否为自定义站点
         custom_sites = self._parse_custom_sites()
         for custom_site in custom_sites:
-            if custom_site['name'] == site:
-                return self._signin_custom_site(custom_site)
+            if custom_site['name'] == site and custom_site.get('account', '') == account:
+                return self._signin_custom_site(custom_site, context)
 
         # 预设站点签到
-        if site == "hh":
-            return self._signin_hh()
-        elif site == "ou":
-            return self._signin_ou()
-        elif site == "ttg":
-            return self._signin_ttg()
-        else:
-            return {"success": False, "message": f"不支持的站点：{site}"}
+        if site in BUILTIN_PROFILES:
+            return self._signin_preset_site(site, context, account)
+
+        # MoviePilot站点签到
+        mp_sites = self._get_mp_sites()
+        if site in mp_sites:
+            return self._signin_mp_site(mp_sites[site], context)
+        return {"success": False, "message": f"不支持的站点：{site}"}
 
-    def _signin_custom_site(self, site_config: dict) -> dict:
+    def _signin_preset_site(self, site: str, context: RunContext = None, account: str = "") -> dict:
+        """
+        按内置站点配置签到，默认账号优先使用MP站点Cookie，其它账号使用手动填写的Cookie
+        """
+        profile = compile_profile(BUILTIN_PROFILES[site])
+        try:
+            if account:
+                cookie = dict(self.__manual_accounts(site)).get(account)
+            else:
+                cookie = self._get_site_cookie(site, PRESET_SITES[site])
+            if not cookie:
+                return {"success": False, "message": f"未找到{profile.name}站点Cookie配置"}
+            if profile.mode == MODE_BROWSER:
+                result = self.__signin_http_first(self._result_key(site, account), profile.url, cookie, context)
+                if result is not None:
+                    return result
+
+            from .sites.profile_signin import ProfileSignin
+            return ProfileSignin(profile, cookie, context, account).signin()
+        except Exception as e:
+            logger.error(f"{profile.name}站点签到失败：{str(e)}")
+            return {"success": False, "message": "签到失败：" + str(e)}
+
+    def _signin_custom_site(self, site_config: dict, context: RunContext = None) -> dict:
         """
         执行自定义站点签到
         """
         try:
-            from .sites.custom_signin import CustomSignin
-            signin_handler = CustomSignin(site_config)
-            return signin_handler.signin()
+            from .sites.profile_signin import ProfileSignin
+            profile = custom_profile(site_config['name'], site_config['domain'], site_config.get('profile'))
+            account = site_config.get('account', '')
+            if not site_config.get('profile'):
+                result = self.__signin_http_first(self._result_key(site_config['name'], account), profile.url,
+                                                  site_config['cookie'], context)
+                if result is not None:
+                    return result
+            return ProfileSignin(profile, site_config['cookie'], context, account).signin()
         except Exception as e:
             logger.error(f"自定义站点 {site_config['name']} 签到失败：{str(e)}")
             return {"success": False, "message": f"签到失败：{str(e)}"}
 
-    def _save_signin_result(self, site: str, result: dict):
+    def __signin_http_first(self, name: str, url: str, cookie: str, context: RunContext = None) -> Optional[dict]:
+        """
+        内存紧张时先识别站点，支持attendance.php的站点通过HTTP签到，不启动浏览器；无需或无法HTTP签到时返回None
+        """
+        if not memory_admission.under_pressure():
+            return None
+        return self._signin_mp_site({"name": name, "url": url, "domain": url, "cookie": cookie},
+                                    context, browser=False)
+
+    def _save_signin_result(self, site: str, result: dict, duration: float = None):
         """
         保存签到结果
         """
@@ -755,11 +2457,13 @@ class QdSignIn(_PluginBase):
             if today not in history:
                 history[today] = {}
 
-            history[today][site] = {
+            entry = {
                 "time": datetime.now().strftime("%H:%M:%S"),
                 "success": result.get("success", False),
-                "message": result.get("message", "")
+                "message": result.get("message", ""),
+                "duration": round(duration or 0, 2)
             }
+            history[today][site] = entry
 
             # 只保留最近30天的记录
             cutoff_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
@@ -767,10 +2471,29 @@ class QdSignIn(_PluginBase):
 
             self.save_data("signin_history", history)
 
+            # 更新站点最近结果汇总
+            summary = self.__get_site_summary()
+            summary[site] = self.__summary_entry(summary.get(site), entry, today)
+            self.save_data("site_summary", summary)
+            self._history_version += 1
+
         except Exception as e:
             logger.error(f"保存签到结果失败：{str(e)}")
 
-    def _send_notification(self, results: dict):
+    def _save_run_report(self, report: RunReport):
+        """
+        保存运行耗时指标，只保留最近30次
+        """
+        try:
+            reports = self.get_data("run_reports") or []
+            reports.append(report.to_dict())
+            self.save_data("run_reports", reports[-30:])
+            self._last_run = reports[-1]
+            self._history_version += 1
+        except Exception as e:
+            logger.error(f"保存运行指标失败：{str(e)}")
+
+    def _send_notification(self, results: dict, report: RunReport = None):
         """
         发送签到结果通知
         """
@@ -782,7 +2505,11 @@ class QdSignIn(_PluginBase):
             if success_sites:
                 message += f"✅ 成功：{', '.join(success_sites)}\n"
             if failed_sites:
-                message += f"❌ 失败：{', '.join(failed_sites)}"
+                message += f"❌ 失败：{', '.join(failed_sites)}\n"
+            if report:
+                message += f"⏱ 首个结果 {report.first_result or 0:.0f} 秒，总耗时 {report.finished or 0:.0f} 秒"
+                if report.reaped:
+                    message += f"\n🧹 已清理 {report.reaped} 个残留浏览器进程"
 
             # 发送系统通知
             self.systemmessage.put(message, title="站点签到助手")
@@ -795,6 +2522,10 @@ class QdSignIn(_PluginBase):
         退出插件
         """
         try:
+            # 中止正在进行的签到并关闭浏览器
+            if self._cancel_token:
+                self._cancel_token.cancel("插件已停止")
+            virtual_display.stop()
             if self._scheduler:
                 self._scheduler.remove_all_jobs()
                 if self._scheduler.running:
@@ -803,54 +2534,6 @@ class QdSignIn(_PluginBase):
         except Exception as e:
             logger.error(f"停止服务失败：{str(e)}")
 
-    def _signin_hh(self) -> dict:
-        """
-        HH站点签到
-        """
-        try:
-            cookie = self._get_site_cookie("hh", "hhanclub.top")
-            if not cookie:
-                return {"success": False, "message": "未找到HH站点Cookie配置"}
-
-            from .sites.hh_signin import HHSignin
-            signin_handler = HHSignin(cookie)
-            return signin_handler.signin()
-        except Exception as e:
-            logger.error(f"HH站点签到失败：{str(e)}")
-            return {"success": False, "message": "签到失败：" + str(e)}
-
-    def _signin_ou(self) -> dict:
-        """
-        OU站点签到
-        """
-        try:
-            cookie = self._get_site_cookie("ou", "ourbits.club")
-            if not cookie:
-                return {"success": False, "message": "未找到OU站点Cookie配置"}
-
-            from .sites.ou_signin import OUSignin
-            signin_handler = OUSignin(cookie)
-            return signin_handler.signin()
-        except Exception as e:
-            logger.error(f"OU站点签到失败：{str(e)}")
-            return {"success": False, "message": "签到失败：" + str(e)}
-
-    def _signin_ttg(self) -> dict:
-        """
-        TTG站点签到
-        """
-        try:
-            cookie = self._get_site_cookie("ttg", "totheglory.im")
-            if not cookie:
-                return {"success": False, "message": "未找到TTG站点Cookie配置"}
-
-            from .sites.ttg_signin import TTGSignin
-            signin_handler = TTGSignin(cookie)
-            return signin_handler.signin()
-        except Exception as e:
-            logger.error(f"TTG站点签到失败：{str(e)}")
-            return {"success": False, "message": "签到失败：" + str(e)}
-
     @eventmanager.register(EventType.PluginAction)
     def signin_event(self, event: Event):
         """
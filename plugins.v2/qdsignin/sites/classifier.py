@@ -0,0 +1,49 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# 页面文本类别
+SUCCESS = "success"
+ALREADY = "already"
+ERROR = "error"
+LOGIN = "login"
+
+# 读取页面可见文本，只传输文本而不是整个DOM
+PAGE_TEXT_SCRIPT = "return document.body ? document.body.innerText : '';"
+
+
+class PageClassifier:
+    """
+    页面文本分类器：所有类别的关键字编译为一个正则，对页面文本扫描一次。
+    同一位置优先匹配较长的关键字（“今日已签到”不会被识别为“已签到”），
+    多个类别同时命中时按类别的定义顺序取第一个
+    """
+
+    def __init__(self, markers: Dict[str, List[str]]):
+        self.priority = list(markers)
+        self._classes = {}
+        for name, keywords in markers.items():
+            for keyword in keywords:
+                # 空关键字会匹配任意位置
+                if keyword:
+                    self._classes.setdefault(keyword.lower(), name)
+        keywords = sorted(self._classes, key=len, reverse=True)
+        self._pattern = re.compile("|".join(re.escape(keyword) for keyword in keywords), re.IGNORECASE) \
+            if keywords else None
+
+    def classify(self, text: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        返回命中的类别和关键字，未命中时返回(None, None)
+        """
+        if not self._pattern:
+            return None, None
+        found = {}
+        for match in self._pattern.finditer(text or ""):
+            marker = match.group(0)
+            name = self._classes[marker.lower()]
+            found.setdefault(name, marker)
+            if name == self.priority[0]:
+                break
+        for name in self.priority:
+            if name in found:
+                return name, found[name]
+        return None, None
@@ -0,0 +1,72 @@
+from typing import List, Optional
+
+from app.log import logger
+
+# 图片资源
+IMAGE_PATTERNS = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.bmp*"]
+# 字体和音视频资源
+FONT_MEDIA_PATTERNS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*",
+                       "*.mp4*", "*.webm*", "*.mp3*", "*.ogg*", "*.m4a*", "*.flv*"]
+# 默认屏蔽的第三方统计与广告域名
+DEFAULT_BLOCKED_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "doubleclick.net",
+    "hm.baidu.com",
+    "cnzz.com",
+    "cloudflareinsights.com",
+]
+
+# 统计页面传输字节数与加载耗时
+METRICS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = nav ? (nav.transferSize || 0) : 0;
+for (const r of resources) { bytes += r.transferSize || 0; }
+let loadMs = 0;
+if (nav) { loadMs = (nav.domContentLoadedEventEnd || nav.responseEnd) - nav.startTime; }
+return {bytes: bytes, load_ms: Math.round(loadMs), resources: resources.length};
+"""
+
+
+def apply_lean_options(chrome_options, headless: bool = False, block_images: bool = True):
+    """
+    轻量模式启动参数：DOM就绪即返回、不加载图片、可选无头
+    """
+    chrome_options.page_load_strategy = "eager"
+    if block_images:
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if headless:
+        chrome_options.add_argument("--headless=new")
+    chrome_options.add_argument("--mute-audio")
+
+
+def execute_cdp(driver, cmd: str, params: Optional[dict] = None):
+    """
+    执行DevTools命令：本地Chrome使用execute_cdp_cmd，远程WebDriver没有该方法，通过Chrome的远程命令执行
+    """
+    if hasattr(driver, "execute_cdp_cmd"):
+        return driver.execute_cdp_cmd(cmd, params or {})
+    return driver.execute("executeCdpCommand", {"cmd": cmd, "params": params or {}}).get("value")
+
+
+def block_requests(driver, hosts: Optional[List[str]] = None, block_images: bool = True) -> bool:
+    """
+    通过DevTools屏蔽图片、字体、音视频和第三方域名请求
+    """
+    patterns = list(FONT_MEDIA_PATTERNS)
+    if block_images:
+        patterns.extend(IMAGE_PATTERNS)
+    for host in hosts if hosts is not None else DEFAULT_BLOCKED_HOSTS:
+        host = host.strip()
+        if host:
+            patterns.append(f"*{host}/*")
+    try:
+        execute_cdp(driver, "Network.enable")
+        execute_cdp(driver, "Network.setBlockedURLs", {"urls": patterns})
+        return True
+    except Exception as e:
+        logger.warning(f"设置请求屏蔽失败：{str(e)}")
+        return False
+
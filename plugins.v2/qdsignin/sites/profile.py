@@ -0,0 +1,214 @@
+import json
+import os
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from .classifier import ALREADY, ERROR, LOGIN, SUCCESS, PageClassifier
+from .cookies import site_root
+
+# 签到方式
+MODE_HTTP = "http"
+MODE_BROWSER = "browser"
+MODE_VISUAL = "visual"
+
+# 步骤类型
+STEP_CLICK = "click"
+STEP_SLEEP = "sleep"
+STEP_VISUAL = "visual"
+STEP_POLL = "poll"
+
+
+class SiteProfile:
+    """
+    站点签到配置，加载时编译一次：校验步骤、整理候选XPath、编译结果关键字分类器、解析模板路径。
+
+    配置项：
+    - name/url：站点名称和首页地址
+    - mode：http（直接请求签到地址）、browser（浏览器）、visual（需要可见窗口的视觉识别）
+    - signin_url：http方式请求的签到地址，相对地址基于站点根地址
+    - check_login：访问后检查是否跳转到登录页（login_url）或页面包含登录提示
+    - steps：浏览器步骤列表
+        {"click": [XPath, ...], "timeout": 15, "wait": 3, "message": "..."} 依次尝试候选元素，点击第一个可点击的
+        {"sleep": 秒数}
+        {"visual": "模板图片", "threshold": 0.6, "retries": 5, "message": "..."} 匹配模板并点击
+        {"poll": XPath, "timeout": 180, "interval": 2, "scroll": 100, "message": "..."} 等待元素出现即签到成功
+    - markers：结果关键字，{"success": [], "already": [], "error": [], "login": []}
+    - retries：出错后的重试次数
+    - screenshot：签到后保存截图
+    - chrome_arguments：额外的Chrome启动参数
+    """
+
+    def __init__(self, data: dict):
+        self.name: str = data.get("name") or ""
+        self.url: str = self._normalize_url(data.get("url") or "")
+        self.mode: str = data.get("mode") or MODE_BROWSER
+        if self.mode not in (MODE_HTTP, MODE_BROWSER, MODE_VISUAL):
+            raise ValueError(f"不支持的签到方式：{self.mode}")
+        signin_url = data.get("signin_url") or ""
+        if signin_url and not signin_url.startswith("http"):
+            # 相对地址基于站点根地址，首页地址可能带有路径（如index.php）
+            signin_url = urljoin(site_root(self.url), signin_url.lstrip("/"))
+        self.signin_url: str = signin_url
+        self.check_login: bool = data.get("check_login", True)
+        self.login_url: str = data.get("login_url") or "login"
+        self.retries: int = int(data.get("retries") or 3)
+        self.screenshot: bool = data.get("screenshot", False)
+        self.chrome_arguments: List[str] = list(data.get("chrome_arguments") or ["--start-maximized"])
+        self.steps: List[dict] = [self._compile_step(step) for step in data.get("steps") or []]
+        markers = {name: self._compile_keywords(data.get("markers", {}).get(name))
+                   for name in (SUCCESS, ALREADY, ERROR, LOGIN)}
+        self.classifier: Optional[PageClassifier] = None
+        if any(markers.values()):
+            self.classifier = PageClassifier({name: words for name, words in markers.items() if words})
+        if self.mode == MODE_HTTP and not self.signin_url:
+            raise ValueError(f"站点 {self.name} 使用http方式时需要配置signin_url")
+
+    @staticmethod
+    def _normalize_url(url: str) -> str:
+        if url and not url.startswith("http"):
+            url = f"https://{url.strip('/')}/"
+        return url
+
+    @staticmethod
+    def _compile_keywords(keywords) -> List[str]:
+        """整理结果关键字，去除空关键字，空关键字会匹配任意页面"""
+        if isinstance(keywords, str):
+            keywords = [keywords]
+        return [str(keyword).strip() for keyword in keywords or [] if str(keyword).strip()]
+
+    @staticmethod
+    def _compile_step(step: dict) -> dict:
+        """校验步骤并补全默认值"""
+        if STEP_CLICK in step:
+            xpaths = step[STEP_CLICK]
+            return {
+                "type": STEP_CLICK,
+                "xpaths": tuple([xpaths] if isinstance(xpaths, str) else xpaths),
+                "timeout": float(step.get("timeout", 15)),
+                "wait": float(step.get("wait", 0)),
+                "message": step.get("message") or "未找到签到按钮"
+            }
+        if STEP_SLEEP in step:
+            return {"type": STEP_SLEEP, "seconds": float(step[STEP_SLEEP])}
+        if STEP_VISUAL in step:
+            template = step[STEP_VISUAL]
+            if not os.path.isabs(template):
+                template = os.path.join(os.path.dirname(__file__), template)
+            return {
+                "type": STEP_VISUAL,
+                "template": template,
+                "threshold": float(step.get("threshold", 0.6)),
+                "retries": int(step.get("retries", 5)),
+                "message": step.get("message") or "未能找到签到按钮"
+            }
+        if STEP_POLL in step:
+            return {
+                "type": STEP_POLL,
+                "xpath": step[STEP_POLL],
+                "timeout": float(step.get("timeout", 180)),
+                "interval": float(step.get("interval", 2)),
+                "scroll": int(step.get("scroll", 0)),
+                "message": step.get("message") or "签到超时，未检测到成功提示"
+            }
+        raise ValueError(f"无法识别的签到步骤：{step}")
+
+    @property
+    def visual(self) -> bool:
+        return self.mode == MODE_VISUAL
+
+
+# 内置站点配置
+BUILTIN_PROFILES: Dict[str, dict] = {
+    "hh": {
+        "name": "HH",
+        "url": "https://hhanclub.top/",
+        "mode": MODE_VISUAL,
+        "check_login": False,
+        "screenshot": True,
+        "chrome_arguments": [
+            "--force-device-scale-factor=1",
+            "--window-size=1200,800",
+            "--start-maximized",
+            "--log-level=3",
+        ],
+        "steps": [
+            {"click": "//*[@id='user-avatar']", "timeout": 15, "message": "未找到用户头像"},
+            {"click": "//a[contains(@href, 'attendance.php')]", "timeout": 15, "message": "未找到签到链接"},
+            {"sleep": 20},
+            {"visual": "red_dot_template.png", "threshold": 0.6, "retries": 5, "message": "未能找到签到按钮"},
+            {"sleep": 3},
+        ],
+    },
+    "ou": {
+        "name": "OU",
+        "url": "https://ourbits.club/index.php",
+        "check_login": False,
+        "steps": [
+            {"click": "//a[@href='attendance.php' and contains(@class, 'faqlink')]", "timeout": 10, "wait": 3,
+             "message": "未能找到签到链接"},
+            {"poll": "//h2[@align='left' and contains(text(), '签到成功')]", "timeout": 180, "interval": 2,
+             "scroll": 100},
+        ],
+    },
+    "ttg": {
+        "name": "TTG",
+        "url": "https://totheglory.im/",
+        "login_url": "login.php",
+        "steps": [
+            {"click": [
+                "//a[contains(@href, 'signed.php')]",
+                "//a[contains(text(), '签到')]",
+                "//input[@type='submit' and contains(@value, '签到')]",
+                "//button[contains(text(), '签到')]"
+            ], "timeout": 15, "wait": 5},
+        ],
+        "markers": {
+            SUCCESS: ["签到成功", "已签到"],
+            ALREADY: ["今日已签到", "已经签到"],
+            ERROR: ["签到失败"],
+            LOGIN: ["登录"],
+        },
+    },
+}
+
+# 自定义站点默认配置，可被站点配置中的JSON覆盖
+CUSTOM_PROFILE: dict = {
+    "steps": [
+        {"click": [
+            "//a[contains(@href, 'attendance.php')]",
+            "//a[contains(@href, 'signed.php')]",
+            "//a[contains(text(), '签到')]",
+            "//a[contains(text(), '打卡')]",
+            "//input[@type='submit' and contains(@value, '签到')]",
+            "//button[contains(text(), '签到')]",
+            "//button[contains(text(), '打卡')]"
+        ], "timeout": 15, "wait": 5},
+    ],
+    "markers": {
+        SUCCESS: ["签到成功", "已签到", "打卡成功", "已打卡", "success"],
+        ALREADY: ["今日已签到", "已经签到", "今天已经签到", "already"],
+        ERROR: ["签到失败", "打卡失败"],
+        LOGIN: ["登录"],
+    },
+}
+
+# 已编译的站点配置
+_compiled: Dict[str, SiteProfile] = {}
+
+
+def compile_profile(data: dict) -> SiteProfile:
+    """
+    编译站点配置，相同配置只编译一次
+    """
+    key = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    profile = _compiled.get(key)
+    if not profile:
+        profile = _compiled[key] = SiteProfile(data)
+    return profile
+
+
+def custom_profile(name: str, domain: str, overrides: Optional[dict] = None) -> SiteProfile:
+    """
+    自定义站点配置：默认配置合并站点自带的覆盖项
+    """
+    return compile_profile({**CUSTOM_PROFILE, **(overrides or {}), "name": name, "url": domain})
@@ -0,0 +1,172 @@
+import hashlib
+import os
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.log import logger
+
+# 配置目录的占用锁，按目录路径在插件内共享，不同的BrowserProfiles实例看到同一占用状态
+_profile_locks: Dict[str, threading.Lock] = {}
+_profile_guard = threading.Lock()
+
+
+class BrowserProfile:
+    """
+    单个站点的持久化浏览器配置目录
+    """
+
+    # 记录Cookie指纹的标记文件，存在且匹配时说明配置已预热
+    marker_name = ".qdsignin_cookie"
+
+    def __init__(self, path: Path, lock: threading.Lock, cache_size: int):
+        self.path = path
+        self._lock = lock
+        self.cache_size = cache_size
+
+    @property
+    def marker(self) -> Path:
+        return self.path / self.marker_name
+
+    @staticmethod
+    def fingerprint(cookie_string: str) -> str:
+        return hashlib.sha256((cookie_string or "").encode("utf-8")).hexdigest()
+
+    def is_warm(self, cookie_string: str) -> bool:
+        """配置中已保存与当前Cookie一致的登录状态"""
+        try:
+            return self.marker.read_text(encoding="utf-8") == self.fingerprint(cookie_string)
+        except OSError:
+            return False
+
+    def mark_warm(self, cookie_string: str):
+        try:
+            self.marker.write_text(self.fingerprint(cookie_string), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"写入浏览器配置标记失败：{str(e)}")
+
+    def invalidate(self):
+        """登录状态失效，下次重新注入Cookie"""
+        try:
+            self.marker.unlink()
+        except OSError:
+            pass
+
+    def release(self):
+        try:
+            # 更新目录时间，用于判断配置是否过期
+            os.utime(self.path)
+        except OSError:
+            pass
+        finally:
+            self._lock.release()
+
+
+class BrowserProfiles:
+    """
+    持久化浏览器配置管理：按站点复用user-data-dir（含磁盘缓存和Cookie），并限制大小、清理过期配置
+    """
+
+    # 缓存目录，超出大小上限时优先清理
+    cache_dirs = ("Cache", "Code Cache", "GPUCache", "Service Worker", "ShaderCache", "GrShaderCache")
+
+    def __init__(self, root: Path, max_size_mb: int = 200, max_age_days: int = 7):
+        self.root = Path(root)
+        self.max_size = max(max_size_mb, 10) * 1024 * 1024
+        self.max_age = max_age_days * 24 * 3600
+
+    @staticmethod
+    def _dirname(site: str) -> str:
+        return re.sub(r"[^\w.-]", "_", site.lower())
+
+    @staticmethod
+    def _lock(path: Path) -> threading.Lock:
+        with _profile_guard:
+            return _profile_locks.setdefault(str(path), threading.Lock())
+
+    @staticmethod
+    def _in_use(path: Path) -> bool:
+        lock = _profile_locks.get(str(path))
+        return bool(lock and lock.locked())
+
+    def acquire(self, site: str) -> Optional[BrowserProfile]:
+        """获取站点配置目录，同一配置已被其它浏览器占用时返回None"""
+        name = self._dirname(site)
+        lock = self._lock(self.root / name)
+        if not lock.acquire(blocking=False):
+            logger.info(f"{site}站点浏览器配置正在使用，本次使用临时配置")
+            return None
+        path = self.root / name
+        try:
+            path.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            lock.release()
+            logger.warning(f"创建浏览器配置目录失败：{str(e)}")
+            return None
+        # 磁盘缓存占用上限的80%，其余留给Cookie、LocalStorage等
+        return BrowserProfile(path, lock, int(self.max_size * 0.8))
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        total = 0
+        for file in path.rglob("*"):
+            try:
+                if file.is_file() and not file.is_symlink():
+                    total += file.stat().st_size
+            except OSError:
+                continue
+        return total
+
+    def cleanup(self, active_sites: List[str]):
+        """
+        清理未启用站点和过期的配置，超出大小上限的配置先清理缓存，仍超出时整体删除
+        """
+        if not self.root.exists():
+            return
+        active = {self._dirname(site) for site in active_sites}
+        now = time.time()
+        for path in self.root.iterdir():
+            if not path.is_dir():
+                continue
+            if self._in_use(path):
+                continue
+            try:
+                if path.name not in active or now - path.stat().st_mtime > self.max_age:
+                    logger.info(f"清理过期浏览器配置：{path.name}")
+                    shutil.rmtree(path, ignore_errors=True)
+                    continue
+                if self._size(path) <= self.max_size:
+                    continue
+                for cache in self.cache_dirs:
+                    for cache_path in path.rglob(cache):
+                        shutil.rmtree(cache_path, ignore_errors=True)
+                if self._size(path) > self.max_size:
+                    logger.info(f"浏览器配置超出大小上限，已删除：{path.name}")
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    logger.info(f"浏览器配置超出大小上限，已清理缓存：{path.name}")
+            except OSError as e:
+                logger.warning(f"清理浏览器配置失败：{path.name} - {str(e)}")
+
+    def invalidate(self, site: str):
+        """清除站点配置的预热标记"""
+        try:
+            (self.root / self._dirname(site) / BrowserProfile.marker_name).unlink()
+        except OSError:
+            pass
+
+    def clear(self):
+        """删除全部配置，正在使用的配置保留"""
+        if not self.root.exists():
+            return
+        for path in self.root.iterdir():
+            if self._in_use(path):
+                logger.info(f"浏览器配置正在使用，暂不删除：{path.name}")
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,204 @@
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class SiteStats:
+    """
+    站点历史耗时与成功率统计，用于按预期耗时排序（最短预期作业优先）
+    """
+
+    # 指数滑动平均权重
+    alpha: float = 0.3
+    # 没有历史记录时的默认耗时（秒）
+    default_duration: float = 60.0
+    # 成功率下限，避免总失败的站点排序权重无限大
+    min_success_rate: float = 0.2
+
+    def __init__(self, data: Optional[Dict[str, dict]] = None):
+        self.data: Dict[str, dict] = data or {}
+
+    def record(self, site: str, duration: float, success: bool):
+        """记录站点一次签到的耗时和结果"""
+        stat = self.data.get(site)
+        if not stat:
+            self.data[site] = {
+                "duration": round(duration, 2),
+                "success_rate": 1.0 if success else 0.0,
+                "runs": 1
+            }
+            return
+        stat["duration"] = round(self.alpha * duration + (1 - self.alpha) * stat.get("duration", duration), 2)
+        stat["success_rate"] = round(self.alpha * (1.0 if success else 0.0)
+                                     + (1 - self.alpha) * stat.get("success_rate", 1.0), 4)
+        stat["runs"] = stat.get("runs", 0) + 1
+
+    def record_load(self, site: str, metrics: dict):
+        """记录站点首次加载的传输字节数和耗时，按是否轻量模式分别统计"""
+        if not metrics:
+            return
+        stat = self.data.setdefault(site, {"duration": self.default_duration, "success_rate": 1.0, "runs": 0})
+        key = "lean_load" if metrics.get("lean") else "normal_load"
+        load = stat.get(key)
+        if not load:
+            stat[key] = {"bytes": metrics.get("bytes", 0), "load_ms": metrics.get("load_ms", 0), "runs": 1}
+            self._record_engine(stat, metrics)
+            return
+        load["bytes"] = int(self.alpha * metrics.get("bytes", 0) + (1 - self.alpha) * load.get("bytes", 0))
+        load["load_ms"] = int(self.alpha * metrics.get("load_ms", 0) + (1 - self.alpha) * load.get("load_ms", 0))
+        load["runs"] = load.get("runs", 0) + 1
+        self._record_engine(stat, metrics)
+
+    def _record_engine(self, stat: dict, metrics: dict):
+        """按浏览器引擎统计会话创建和页面加载耗时"""
+        engine = metrics.get("engine")
+        if not engine:
+            return
+        engines = stat.setdefault("engines", {})
+        load = engines.get(engine)
+        if not load:
+            engines[engine] = {"setup_ms": metrics.get("setup_ms", 0), "load_ms": metrics.get("load_ms", 0), "runs": 1}
+            return
+        load["setup_ms"] = int(self.alpha * metrics.get("setup_ms", 0) + (1 - self.alpha) * load.get("setup_ms", 0))
+        load["load_ms"] = int(self.alpha * metrics.get("load_ms", 0) + (1 - self.alpha) * load.get("load_ms", 0))
+        load["runs"] = load.get("runs", 0) + 1
+
+    def load_summary(self, site: str) -> str:
+        """站点在普通模式和轻量模式下的平均加载指标"""
+        stat = self.data.get(site) or {}
+        parts = []
+        for key, name in (("normal_load", "普通模式"), ("lean_load", "轻量模式")):
+            load = stat.get(key)
+            if load:
+                parts.append(f"{name} {load['bytes'] / 1024:.0f} KB / {load['load_ms']} ms")
+        for engine, load in (stat.get("engines") or {}).items():
+            parts.append(f"{engine} 启动 {load['setup_ms']} ms / 加载 {load['load_ms']} ms")
+        return "，".join(parts)
+
+    def expected_duration(self, site: str) -> float:
+        """站点预期耗时，无记录时取已知站点的中位数"""
+        stat = self.data.get(site)
+        if stat:
+            return stat.get("duration", self.default_duration)
+        durations = sorted(s.get("duration", self.default_duration) for s in self.data.values())
+        if not durations:
+            return self.default_duration
+        return durations[len(durations) // 2]
+
+    def priority(self, site: str) -> float:
+        """排序权重：预期耗时 / 成功率，越小越先执行"""
+        stat = self.data.get(site) or {}
+        success_rate = max(stat.get("success_rate", 1.0), self.min_success_rate)
+        return self.expected_duration(site) / success_rate
+
+    def order(self, sites: List[str]) -> List[str]:
+        """按权重排序站点，权重相同时保持配置顺序"""
+        return sorted(sites, key=self.priority)
+
+
+class SelectorCache:
+    """
+    各站点候选选择器的命中记录：上次命中的选择器优先，其余按命中率排序，持续未命中的选择器逐渐靠后
+    """
+
+    def __init__(self, data: Optional[Dict[str, dict]] = None):
+        self.data: Dict[str, dict] = data or {}
+
+    def order(self, site: str, step: str, xpaths) -> List[str]:
+        """按命中记录排序候选选择器，没有记录时保持配置顺序"""
+        record = self.data.get(site, {}).get("steps", {}).get(step)
+        if not record:
+            return list(xpaths)
+        hits = record.get("selectors", {})
+        last = record.get("last")
+
+        def _rank(item):
+            index, xpath = item
+            stat = hits.get(xpath, {})
+            rate = (stat.get("hits", 0) + 1) / (stat.get("hits", 0) + stat.get("misses", 0) + 2)
+            return xpath != last, -rate, index
+
+        return [xpath for _, xpath in sorted(enumerate(xpaths), key=_rank)]
+
+    def record(self, site: str, step: str, tried: List[str], winner: Optional[str]):
+        """
+        记录一次查找结果：命中的选择器计一次命中，排在它前面的选择器各计一次未命中；
+        全部未命中时所有候选各计一次未命中
+        """
+        record = self.data.setdefault(site, {}).setdefault("steps", {}).setdefault(step, {})
+        selectors = record.setdefault("selectors", {})
+        for xpath in tried:
+            stat = selectors.setdefault(xpath, {"hits": 0, "misses": 0})
+            if xpath == winner:
+                stat["hits"] += 1
+                record["last"] = winner
+                break
+            stat["misses"] += 1
+
+    def record_marker(self, site: str, text_class: Optional[str], marker: Optional[str]):
+        """记录站点结果识别命中的关键字"""
+        if not marker:
+            return
+        markers = self.data.setdefault(site, {}).setdefault("markers", {})
+        markers[marker] = markers.get(marker, 0) + 1
+        self.data[site]["last_marker"] = {"class": text_class, "marker": marker}
+
+    def last_marker(self, site: str) -> Optional[dict]:
+        return self.data.get(site, {}).get("last_marker")
+
+
+class RunReport:
+    """
+    单次运行的时间指标：首个结果耗时与总耗时
+    """
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.first_result: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.sites = 0
+        self.success = 0
+        # 虚拟显示的启动次数、复用次数和启动耗时
+        self.display: dict = {}
+        # 插件初始化耗时（毫秒）
+        self.init_ms = 0
+        # 运行结束时清理的残留浏览器进程数
+        self.reaped = 0
+
+    def site_done(self, success: bool = False):
+        """记录一个站点完成"""
+        self.sites += 1
+        if success:
+            self.success += 1
+        if self.first_result is None:
+            self.first_result = time.monotonic() - self.started
+
+    def finish(self):
+        self.finished = time.monotonic() - self.started
+
+    def record_display(self, before: dict, after: dict):
+        """记录本次运行中虚拟显示的使用情况"""
+        starts = after["starts"] - before["starts"]
+        reuses = after["reuses"] - before["reuses"]
+        if starts or reuses:
+            self.display = {
+                "starts": starts,
+                "reuses": reuses,
+                "startup_ms": after["startup_ms"] if starts else 0
+            }
+
+    def to_dict(self) -> dict:
+        data = {
+            "start": self.start_time,
+            "sites": self.sites,
+            "success": self.success,
+            "first_result": round(self.first_result or 0, 2),
+            "makespan": round(self.finished or 0, 2),
+            "init_ms": self.init_ms
+        }
+        if self.display:
+            data["display"] = self.display
+        if self.reaped:
+            data["reaped"] = self.reaped
+        return data
@@ -0,0 +1,65 @@
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+
+class RunCheckpoints:
+    """
+    运行检查点：记录每次运行的全部站点、已完成的站点和结果，每完成一个站点立即保存。
+    插件重启或重载后只继续当天未完成的站点，已完成的站点不会重复签到
+    """
+
+    # 多个运行同时写入同一份数据
+    _lock = threading.Lock()
+
+    def __init__(self, load: Callable[[], Optional[Dict[str, dict]]], save: Callable[[Dict[str, dict]], None]):
+        self._load = load
+        self._save = save
+
+    @staticmethod
+    def today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def _update(self, run_id: str, update: Callable[[dict], None]):
+        with self._lock:
+            data = self._load() or {}
+            checkpoint = data.get(run_id)
+            if checkpoint is None:
+                return
+            update(checkpoint)
+            self._save(data)
+
+    def start(self, run_id: str, sites: List[str]):
+        """新运行开始，同时清理非当天的检查点"""
+        with self._lock:
+            today = self.today()
+            data = {key: value for key, value in (self._load() or {}).items() if value.get("date") == today}
+            data[run_id] = {"date": today, "sites": list(sites), "done": [], "results": {}}
+            self._save(data)
+
+    def record(self, run_id: str, key: str, result: dict):
+        """记录一个站点或账号的结果"""
+        self._update(run_id, lambda checkpoint: checkpoint["results"].__setitem__(key, result))
+
+    def site_done(self, run_id: str, site: str):
+        """站点的全部账号已完成"""
+        self._update(run_id, lambda checkpoint: site in checkpoint["done"] or checkpoint["done"].append(site))
+
+    def finish(self, run_id: str):
+        """运行正常结束，删除检查点"""
+        with self._lock:
+            data = self._load() or {}
+            if data.pop(run_id, None) is not None:
+                self._save(data)
+
+    def get(self, run_id: str) -> Optional[dict]:
+        with self._lock:
+            return (self._load() or {}).get(run_id)
+
+    def pending(self) -> List[str]:
+        """当天未完成的运行"""
+        with self._lock:
+            today = self.today()
+            return [run_id for run_id, checkpoint in (self._load() or {}).items()
+                    if checkpoint.get("date") == today
+                    and any(site not in checkpoint.get("done", []) for site in checkpoint.get("sites", []))]
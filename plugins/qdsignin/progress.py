@@ -0,0 +1,117 @@
+import threading
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+
+
+class RunProgress:
+    """
+    单次运行的实时进度，签到线程写入，API线程读取快照；
+    站点的多个账号分别计数，键为 站点名@账号名；多个站点同时签到时记录全部进行中的站点
+    """
+
+    def __init__(self, sites: List[str], run_id: Optional[str] = None):
+        # 继续中断的运行时沿用原来的运行ID
+        self.run_id = run_id or datetime.now().strftime("%Y%m%d%H%M%S%f")
+        self.start_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.started = time.monotonic()
+        self.sites = list(sites)
+        self.running_sites: List[str] = []
+        self.results = {}
+        self.first_result: Optional[float] = None
+        self.finished: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _site(key: str) -> str:
+        return key.split("@", 1)[0]
+
+    def begin_site(self, site: str):
+        with self._lock:
+            if site not in self.running_sites:
+                self.running_sites.append(site)
+
+    def site_done(self, site: str, result: dict, duration: float = 0):
+        with self._lock:
+            self.results[site] = {
+                "success": result.get("success", False),
+                "message": result.get("message", ""),
+                "duration": round(duration or 0, 2)
+            }
+            if self._site(site) in self.running_sites:
+                self.running_sites.remove(self._site(site))
+            if self.first_result is None:
+                self.first_result = time.monotonic() - self.started
+
+    def finish(self):
+        with self._lock:
+            self.running_sites = []
+            self.finished = time.monotonic() - self.started
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "run_id": self.run_id,
+                "start": self.start_time,
+                "running": self.finished is None,
+                "elapsed": round((self.finished if self.finished is not None
+                                  else time.monotonic() - self.started), 2),
+                "first_result": round(self.first_result, 2) if self.first_result is not None else None,
+                "total": len(self.sites),
+                "done": len(self.results),
+                "current": self.running_sites[0] if self.running_sites else None,
+                "running_sites": list(self.running_sites),
+                "pending": [site for site in self.sites
+                            if site not in self.results and self._site(site) not in self.running_sites],
+                "results": dict(self.results)
+            }
+
+
+class ProgressNotifier:
+    """
+    逐站点结果通知：两条消息之间至少间隔interval秒，间隔内完成的站点合并为一条消息
+    """
+
+    def __init__(self, send: Callable[[str], None], interval: float = 60):
+        self.send = send
+        self.interval = interval
+        self._pending = []
+        self._last_sent = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def add(self, site: str, result: dict):
+        with self._lock:
+            if self._closed:
+                return
+            self._pending.append(f"{'✅' if result.get('success') else '❌'} {site}：{result.get('message', '')}")
+            wait = self._last_sent + self.interval - time.monotonic()
+            if wait <= 0:
+                self._flush_locked()
+            elif not self._timer:
+                self._timer = threading.Timer(wait, self._flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush(self):
+        with self._lock:
+            self._timer = None
+            if not self._closed:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+        message, self._pending = "\n".join(self._pending), []
+        self._last_sent = time.monotonic()
+        self.send(message)
+
+    def close(self):
+        """运行结束，最终汇总通知已包含全部结果，丢弃未发送的增量消息"""
+        with self._lock:
+            self._closed = True
+            self._pending = []
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
@@ -0,0 +1,190 @@
+import time
+
+from app.log import logger
+
+from .classifier import PageClassifier
+from .cookies import parse_cookie_string
+from .engine import BrowserSession, SeleniumEngine
+from .ratelimit import host_limiter
+from .runtime import RunContext, DriverWatchdog, SigninCancelled, browser_slots
+
+
+class BaseSignin:
+    """
+    站点签到基类，统一浏览器初始化、超时和取消处理
+    """
+
+    # 站点名称
+    site_name: str = ""
+    # Cookie字符串
+    cookie_string: str = ""
+    # 站点额外的Chrome启动参数
+    chrome_arguments: list = ["--start-maximized"]
+    # 签到流程不依赖可见窗口，轻量模式下可无头运行
+    supports_headless: bool = True
+    # 轻量模式下屏蔽图片
+    block_images: bool = True
+    # 签到结果分类器
+    classifier: PageClassifier = None
+
+    def __init__(self, context: RunContext = None):
+        self.context = context or RunContext()
+        # 当前占用的浏览器槽位数
+        self._slots_held = 0
+        # 当前浏览器使用的持久化配置
+        self.profile = None
+        # 已使用预热配置直接访问的次数，重试时改为重新注入Cookie
+        self._warm_attempts = 0
+        # 首次访问站点的传输字节数和加载耗时
+        self.metrics = {}
+
+    def setup_driver(self) -> BrowserSession:
+        """创建浏览器会话"""
+        self.context.check()
+        engine = self.context.engine or SeleniumEngine()
+
+        # 限制同时运行的本机浏览器数量，远程浏览器的并发由引擎的会话池控制
+        if getattr(engine, "local", True):
+            browser_slots.acquire(self.context)
+            self._slots_held += 1
+        self._attach_profile()
+        try:
+            return engine.new_session(self)
+        except Exception as e:
+            logger.error(f"初始化驱动失败: {str(e)}")
+            self._release_slot()
+            self._release_profile()
+            raise
+
+    def watch(self, session: BrowserSession) -> DriverWatchdog:
+        """启动看门狗，站点超时或取消时强制关闭浏览器"""
+        return DriverWatchdog(session, self.context, self.site_name).start()
+
+    def quit_driver(self, session: BrowserSession):
+        """关闭浏览器并释放槽位，忽略已被看门狗结束的会话"""
+        try:
+            session.close()
+        finally:
+            self._release_slot()
+            self._release_profile()
+
+    def _attach_profile(self):
+        """使用站点的持久化配置目录，复用磁盘缓存和登录状态"""
+        profiles = self.context.profiles
+        if not profiles or not getattr(self.context.engine, "local", True):
+            return
+        if self._warm_attempts:
+            # 预热配置访问失败后重试，不再信任已保存的登录状态
+            profiles.invalidate(self.site_name)
+        self.profile = profiles.acquire(self.site_name)
+
+    def _release_profile(self):
+        if self.profile:
+            self.profile.release()
+            self.profile = None
+
+    def _release_slot(self):
+        if self._slots_held > 0:
+            self._slots_held -= 1
+            browser_slots.release()
+
+    def open_site(self, session: BrowserSession, url: str) -> bool:
+        """
+        打开站点：持久化配置已预热时直接访问；否则在访问前批量注入Cookie，
+        引擎不支持时退回先访问站点、逐个添加Cookie再刷新；访问前按域名限速
+        """
+        host_limiter.acquire(url, self.context)
+        if self.profile and self.profile.is_warm(self.cookie_string):
+            self._warm_attempts += 1
+            session.open(url)
+            logger.info(f"已使用预热的浏览器配置访问{self.site_name}站点")
+            self._collect_metrics(session)
+            return True
+
+        cookies = parse_cookie_string(self.cookie_string)
+        if not cookies:
+            logger.error("Cookie字符串中没有有效的Cookie")
+            return False
+
+        if session.inject_cookies(cookies, url):
+            session.open(url)
+            logger.info(f"已注入{len(cookies)}个Cookie并访问{self.site_name}站点")
+        else:
+            session.open(url)
+            logger.info(f"已访问{self.site_name}站点")
+            if not session.add_cookies(cookies):
+                return False
+            session.refresh()
+            logger.info("已加载Cookie并刷新页面")
+        if self.profile:
+            self.profile.mark_warm(self.cookie_string)
+        self._collect_metrics(session)
+        return True
+
+    def _collect_metrics(self, session: BrowserSession):
+        """记录首次访问站点的加载指标"""
+        metrics = session.metrics()
+        if not metrics:
+            return
+        metrics["lean"] = self.context.lean
+        metrics["engine"] = session.engine_name
+        metrics["setup_ms"] = session.setup_ms
+        self.metrics = metrics
+        logger.info(f"{self.site_name}站点加载完成（{session.engine_name}）：浏览器启动 {session.setup_ms} ms，"
+                    f"{metrics['bytes'] / 1024:.1f} KB，{metrics['load_ms']} ms，{metrics['resources']} 个资源"
+                    f"{'（轻量模式）' if self.context.lean else ''}")
+
+    def wait_clickable(self, session: BrowserSession, xpaths, timeout: float):
+        """可取消的显式等待，返回第一个可点击的元素，超时抛出TimeoutError"""
+        return self.wait_any_clickable(session, xpaths, timeout)[0]
+
+    def wait_any_clickable(self, session: BrowserSession, xpaths, timeout: float):
+        """
+        多个候选XPath在同一个等待内按顺序检查，返回(元素, 命中的XPath)；
+        超时时间受剩余预算约束，超时抛出TimeoutError
+        """
+        if isinstance(xpaths, str):
+            xpaths = [xpaths]
+        deadline = time.monotonic() + self.context.bounded(timeout)
+        while True:
+            self.context.check()
+            for xpath in xpaths:
+                element = session.find_clickable(xpath)
+                if element is not None:
+                    logger.debug(f"找到可点击元素：{xpath}")
+                    return element, xpath
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"等待元素超时：{' | '.join(xpaths)}")
+            self.sleep(0.5)
+
+    def classify_page(self, session: BrowserSession):
+        """一次读取页面文本并分类，返回(类别, 关键字)"""
+        if not self.classifier:
+            return None, None
+        text_class, marker = self.classifier.classify(session.page_text())
+        if text_class:
+            logger.debug(f"{self.site_name}页面命中{text_class}：{marker}")
+        return text_class, marker
+
+    def sleep(self, seconds: float):
+        """可取消的等待"""
+        self.context.sleep(seconds)
+
+    def signin(self) -> dict:
+        """
+        执行签到，统一处理取消和超时
+        """
+        try:
+            result = self._signin()
+        except SigninCancelled as e:
+            logger.warning(f"{self.site_name}站点签到中止：{str(e)}")
+            result = {"success": False, "message": f"签到中止：{str(e)}"}
+        if not result.get("success") and self.context.profiles:
+            # 签到失败时下次重新注入Cookie
+            self.context.profiles.invalidate(self.site_name)
+        if self.metrics:
+            result["metrics"] = self.metrics
+        return result
+
+    def _signin(self) -> dict:
+        raise NotImplementedError
@@ -0,0 +1,170 @@
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.log import logger
+
+# 不随缓存内容返回的响应头：内容已解压，长度按缓存内容重新计算
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class AssetCache:
+    """
+    静态资源缓存：Playwright浏览器的样式、脚本、图片和字体请求经由该缓存，按URL保存，所有站点会话共享。
+    只缓存响应头声明了有效期（Cache-Control的max-age或Expires）且允许共享缓存的200响应，过期后重新请求；
+    总大小超出上限时淘汰最久未使用的资源
+    """
+
+    # 缓存的资源类型
+    resource_types = {"stylesheet", "script", "image", "font"}
+
+    def __init__(self, max_mb: int = 100):
+        self.max_bytes = max_mb * 1024 * 1024
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        # 统计：命中次数、未命中次数、命中节省的字节数
+        self.hits = 0
+        self.misses = 0
+        self.saved_bytes = 0
+
+    def resize(self, max_mb: int):
+        with self._lock:
+            self.max_bytes = max_mb * 1024 * 1024
+            self._evict()
+
+    @staticmethod
+    def lifetime(headers: Dict[str, str]) -> Optional[float]:
+        """按响应头计算可缓存的秒数，不可缓存时返回None"""
+        cache_control = (headers.get("cache-control") or "").lower()
+        if any(directive in cache_control for directive in ("no-store", "no-cache", "private")):
+            return None
+        if (headers.get("vary") or "").strip() == "*":
+            return None
+        match = re.search(r"(?:s-maxage|max-age)\s*=\s*(\d+)", cache_control)
+        if match:
+            return float(match.group(1)) or None
+        expires = headers.get("expires")
+        if not expires:
+            return None
+        try:
+            expires_at = parsedate_to_datetime(expires).timestamp()
+            date = parsedate_to_datetime(headers["date"]).timestamp() if headers.get("date") else time.time()
+        except (TypeError, ValueError, IndexError):
+            return None
+        return expires_at - date if expires_at > date else None
+
+    def get(self, url: str) -> Optional[dict]:
+        """取出未过期的资源"""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry and entry["expires"] > time.time():
+                self._entries.move_to_end(url)
+                self.hits += 1
+                self.saved_bytes += len(entry["body"])
+                return entry
+            if entry:
+                self._remove(url)
+            self.misses += 1
+            return None
+
+    def put(self, url: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        """保存可缓存的响应，返回是否已缓存"""
+        if status != 200 or not body or len(body) > self.max_bytes // 10:
+            return False
+        headers = {name.lower(): value for name, value in headers.items()}
+        lifetime = self.lifetime(headers)
+        if not lifetime:
+            return False
+        with self._lock:
+            if url in self._entries:
+                self._remove(url)
+            self._entries[url] = {
+                "status": status,
+                "headers": {name: value for name, value in headers.items() if name not in _DROPPED_HEADERS},
+                "body": body,
+                "expires": time.time() + lifetime
+            }
+            self._size += len(body)
+            self._evict()
+        return True
+
+    def _remove(self, url: str):
+        entry = self._entries.pop(url)
+        self._size -= len(entry["body"])
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "saved_bytes": self.saved_bytes,
+                "entries": len(self._entries),
+                "size": self._size
+            }
+
+
+class DiskCacheDirs:
+    """
+    Selenium浏览器共享的磁盘缓存目录：Chrome按响应头缓存、校验资源，并在目录超出大小上限时淘汰最久未使用的资源。
+    同一缓存目录同时只能由一个浏览器使用，按需增加目录，目录之间互不共享
+    """
+
+    # 最多保留的缓存目录数
+    max_dirs: int = 4
+
+    def __init__(self):
+        self.root: Optional[Path] = None
+        self.max_mb = 100
+        self._in_use: List[int] = []
+        self._lock = threading.Lock()
+
+    def configure(self, root: Path, max_mb: int):
+        with self._lock:
+            self.root = Path(root)
+            self.max_mb = max_mb
+
+    def acquire(self) -> Optional[Path]:
+        """获取空闲的缓存目录，全部占用时返回None，浏览器使用临时缓存"""
+        with self._lock:
+            if not self.root:
+                return None
+            for index in range(self.max_dirs):
+                if index not in self._in_use:
+                    self._in_use.append(index)
+                    return self.root / str(index)
+        return None
+
+    def release(self, path: Optional[Path]):
+        if not path:
+            return
+        with self._lock:
+            if int(path.name) in self._in_use:
+                self._in_use.remove(int(path.name))
+
+    def clear(self):
+        """删除空闲的缓存目录"""
+        removed = 0
+        with self._lock:
+            if not self.root or not self.root.exists():
+                return
+            for path in self.root.iterdir():
+                if path.is_dir() and path.name.isdigit() and int(path.name) not in self._in_use:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+        if removed:
+            logger.info(f"已清理 {removed} 个浏览器共享磁盘缓存目录")
+
+
+# 插件内所有浏览器共享的资源缓存
+asset_cache = AssetCache()
+disk_cache_dirs = DiskCacheDirs()
@@ -0,0 +1,29 @@
+from typing import List
+from urllib.parse import urlparse
+
+
+def parse_cookie_string(cookie_string: str) -> List[dict]:
+    """
+    解析原始Cookie字符串，忽略没有"="或名称为空的片段
+    """
+    cookies = []
+    if not cookie_string:
+        return cookies
+    for item in cookie_string.split(";"):
+        if "=" not in item:
+            continue
+        name, value = item.strip().split("=", 1)
+        name = name.strip()
+        if not name:
+            continue
+        cookies.append({"name": name, "value": value.strip()})
+    return cookies
+
+
+def site_root(url: str) -> str:
+    """
+    站点根地址，作为Cookie的作用范围
+    """
+    parsed = urlparse(url)
+    return f"{parsed.scheme or 'https'}://{parsed.netloc}/"
+
@@ -0,0 +1,150 @@
+import os
+import shutil
+import subprocess
+import threading
+import time
+from typing import Optional
+
+from app.log import logger
+
+
+class VirtualDisplay:
+    """
+    私有Xvfb虚拟显示：需要可见窗口的步骤首次使用时才启动，运行内复用，空闲后关闭；
+    显示只通过浏览器进程的环境变量传递，不修改MoviePilot进程的DISPLAY
+    """
+
+    # 起始显示编号
+    base_number: int = 99
+    # 屏幕尺寸
+    screen: str = "1920x1080x24"
+
+    def __init__(self, idle_timeout: float = 60):
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._process: Optional[subprocess.Popen] = None
+        self._display: Optional[str] = None
+        self._users = 0
+        self._idle_timer: Optional[threading.Timer] = None
+        # 统计：启动次数、复用次数、最近一次启动耗时
+        self.starts = 0
+        self.reuses = 0
+        self.startup_ms = 0
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.poll() is None
+
+    @property
+    def external(self) -> bool:
+        """运行环境已提供显示（如xvfb-run或桌面环境）"""
+        return bool(os.environ.get("DISPLAY"))
+
+    @property
+    def name(self) -> Optional[str]:
+        """运行中的私有显示，未启动时为None"""
+        return self._display if self.running else None
+
+    def acquire(self) -> Optional[str]:
+        """
+        获取可用的显示，已有外部DISPLAY时直接使用，否则按需启动Xvfb，失败时返回None
+        """
+        with self._lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            if self.external:
+                # 外部已提供显示，不需要私有显示
+                return os.environ.get("DISPLAY")
+            if not self.running:
+                if not self._start():
+                    return None
+            else:
+                self.reuses += 1
+            self._users += 1
+            return self._display
+
+    def release(self):
+        """释放显示，无使用者时开始空闲计时"""
+        with self._lock:
+            if self._users <= 0:
+                return
+            self._users -= 1
+            if self._users == 0 and self.running:
+                self._idle_timer = threading.Timer(self.idle_timeout, self._on_idle)
+                self._idle_timer.daemon = True
+                self._idle_timer.start()
+
+    def _on_idle(self):
+        with self._lock:
+            if self._users == 0:
+                logger.info(f"虚拟显示 {self._display} 空闲，已关闭")
+                self._stop()
+
+    def _free_number(self) -> int:
+        number = self.base_number
+        while os.path.exists(f"/tmp/.X{number}-lock") or os.path.exists(f"/tmp/.X11-unix/X{number}"):
+            number += 1
+        return number
+
+    def _start(self) -> bool:
+        if not shutil.which("Xvfb"):
+            logger.error("未找到Xvfb，无法启动虚拟显示，请安装xvfb或在有显示的环境中运行")
+            return False
+        # 复用上次的显示编号
+        number = int(self._display[1:]) if self._display else self._free_number()
+        display = f":{number}"
+        start = time.monotonic()
+        try:
+            self._process = subprocess.Popen(
+                ["Xvfb", display, "-screen", "0", self.screen, "-nolisten", "tcp"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            logger.error(f"启动虚拟显示失败：{str(e)}")
+            return False
+        socket_path = f"/tmp/.X11-unix/X{number}"
+        while not os.path.exists(socket_path):
+            if self._process.poll() is not None or time.monotonic() - start > 10:
+                logger.error(f"虚拟显示 {display} 启动失败")
+                self._stop()
+                return False
+            time.sleep(0.05)
+        self._display = display
+        self.starts += 1
+        self.startup_ms = int((time.monotonic() - start) * 1000)
+        logger.info(f"虚拟显示 {display} 已启动，耗时 {self.startup_ms} ms")
+        return True
+
+    def env(self, display: str) -> dict:
+        """启动浏览器进程使用的环境变量"""
+        return {**os.environ, "DISPLAY": display}
+
+    def _stop(self):
+        if self._process:
+            try:
+                self._process.terminate()
+                self._process.wait(5)
+            except Exception:
+                self._process.kill()
+            self._process = None
+
+    def stop(self):
+        """插件停止时关闭虚拟显示"""
+        with self._lock:
+            if self._idle_timer:
+                self._idle_timer.cancel()
+                self._idle_timer = None
+            self._users = 0
+            self._stop()
+            self._display = None
+
+    def snapshot(self) -> dict:
+        return {
+            "starts": self.starts,
+            "reuses": self.reuses,
+            "startup_ms": self.startup_ms
+        }
+
+
+# 插件内共享的虚拟显示
+virtual_display = VirtualDisplay()
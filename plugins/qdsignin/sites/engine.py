@@ -0,0 +1,775 @@
+import os
+import threading
+import time
+from typing import List, Optional
+
+from app.log import logger
+
+from .cache import asset_cache, disk_cache_dirs
+from .classifier import PAGE_TEXT_SCRIPT
+from .cookies import site_root
+from .display import virtual_display
+from .lean import DEFAULT_BLOCKED_HOSTS, METRICS_SCRIPT, apply_lean_options, block_requests, execute_cdp
+from .memory import memory_admission
+from .reaper import browser_reaper
+from .runtime import RunContext
+
+
+class BrowserSession:
+    """
+    浏览器会话接口，站点签到流程只通过该接口操作页面，不依赖具体的浏览器引擎
+    """
+
+    # 引擎名称
+    engine_name: str = ""
+
+    def __init__(self, context: RunContext):
+        self.context = context
+        # 会话创建耗时（毫秒）
+        self.setup_ms = 0
+
+    def open(self, url: str):
+        """访问页面"""
+        raise NotImplementedError
+
+    def refresh(self):
+        raise NotImplementedError
+
+    @property
+    def current_url(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def page_source(self) -> str:
+        raise NotImplementedError
+
+    def page_text(self) -> str:
+        """页面可见文本"""
+        return self.execute_script(PAGE_TEXT_SCRIPT) or ""
+
+    def inject_cookies(self, cookies: List[dict], url: str) -> bool:
+        """访问前批量注入Cookie，不支持时返回False"""
+        return False
+
+    def add_cookies(self, cookies: List[dict]) -> int:
+        """访问站点后逐个添加Cookie，返回成功数量"""
+        raise NotImplementedError
+
+    def find_clickable(self, xpath: str):
+        """查找可点击的元素，未找到时返回None"""
+        raise NotImplementedError
+
+    def is_visible(self, xpath: str) -> bool:
+        raise NotImplementedError
+
+    def execute_script(self, script: str):
+        """执行脚本，脚本为函数体，可使用return返回结果"""
+        raise NotImplementedError
+
+    def save_screenshot(self, path: str):
+        raise NotImplementedError
+
+    def capture_screen(self):
+        """截取灰度图像（numpy数组），坐标与click_at一致"""
+        raise NotImplementedError
+
+    def click_at(self, x: int, y: int):
+        """点击capture_screen坐标系中的位置"""
+        raise NotImplementedError
+
+    def metrics(self) -> dict:
+        """当前页面的传输字节数和加载耗时"""
+        try:
+            metrics = self.execute_script(METRICS_SCRIPT) or {}
+        except Exception as e:
+            logger.debug(f"读取页面加载指标失败：{str(e)}")
+            return {}
+        return {
+            "bytes": int(metrics.get("bytes") or 0),
+            "load_ms": int(metrics.get("load_ms") or 0),
+            "resources": int(metrics.get("resources") or 0)
+        }
+
+    def kill(self):
+        """强制结束会话，可能在其它线程调用"""
+        raise NotImplementedError
+
+    def close(self):
+        raise NotImplementedError
+
+
+class SeleniumSession(BrowserSession):
+    """
+    Selenium + ChromeDriver会话，每个会话独立启动一个Chrome
+    """
+
+    engine_name = "selenium"
+
+    def __init__(self, context: RunContext, driver, display: bool = False, cache_dir=None):
+        super().__init__(context)
+        self.driver = driver
+        # 是否占用了插件的虚拟显示
+        self._display = display
+        # 占用的共享磁盘缓存目录
+        self._cache_dir = cache_dir
+        # chromedriver进程号，Chrome进程都是它的子进程
+        process = getattr(getattr(driver, "service", None), "process", None)
+        self.pid = getattr(process, "pid", None)
+
+    def open(self, url: str):
+        self.driver.get(url)
+
+    def refresh(self):
+        self.driver.refresh()
+
+    @property
+    def current_url(self) -> str:
+        return self.driver.current_url
+
+    @property
+    def page_source(self) -> str:
+        return self.driver.page_source
+
+    def inject_cookies(self, cookies: List[dict], url: str) -> bool:
+        root = site_root(url)
+        try:
+            execute_cdp(self.driver, "Network.enable")
+            execute_cdp(self.driver, "Network.clearBrowserCookies")
+            execute_cdp(self.driver, "Network.setCookies", {
+                "cookies": [{"name": cookie["name"], "value": cookie["value"], "url": root} for cookie in cookies]
+            })
+            return True
+        except Exception as e:
+            logger.warning(f"DevTools注入Cookie失败，改用逐个添加：{str(e)}")
+            return False
+
+    def add_cookies(self, cookies: List[dict]) -> int:
+        self.driver.delete_all_cookies()
+        added = 0
+        for cookie in cookies:
+            try:
+                self.driver.add_cookie(cookie)
+                added += 1
+            except Exception as e:
+                logger.warning(f"添加Cookie失败：{cookie['name']} - {str(e)}")
+        return added
+
+    def find_clickable(self, xpath: str):
+        from selenium.webdriver.common.by import By
+        for element in self.driver.find_elements(By.XPATH, xpath):
+            try:
+                if element.is_displayed() and element.is_enabled():
+                    return element
+            except Exception:
+                continue
+        return None
+
+    def is_visible(self, xpath: str) -> bool:
+        from selenium.webdriver.common.by import By
+        try:
+            return any(element.is_displayed() for element in self.driver.find_elements(By.XPATH, xpath))
+        except Exception:
+            return False
+
+    def execute_script(self, script: str):
+        return self.driver.execute_script(script)
+
+    def save_screenshot(self, path: str):
+        self.driver.save_screenshot(path)
+
+    def capture_screen(self):
+        # 使用页面截图，与页面内点击坐标一致；同一显示上的其它浏览器窗口不影响截图和点击
+        import cv2
+        import numpy as np
+        data = np.frombuffer(self.driver.get_screenshot_as_png(), dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+
+    def click_at(self, x: int, y: int):
+        from selenium.webdriver.common.actions.action_builder import ActionBuilder
+        action = ActionBuilder(self.driver)
+        action.pointer_action.move_to_location(x, y)
+        action.pointer_action.click()
+        action.perform()
+        logger.info(f"已点击页面坐标 ({x}, {y})")
+
+    def kill(self):
+        """关闭浏览器，quit卡住时直接结束chromedriver进程"""
+        quitter = threading.Thread(target=self.close, daemon=True)
+        quitter.start()
+        quitter.join(10)
+        process = getattr(getattr(self.driver, "service", None), "process", None)
+        try:
+            if process and process.poll() is None:
+                process.kill()
+        except Exception as e:
+            logger.warning(f"结束chromedriver进程失败：{str(e)}")
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.debug(f"关闭浏览器失败：{str(e)}")
+        finally:
+            browser_reaper.release(self.pid)
+            disk_cache_dirs.release(self._cache_dir)
+            self._cache_dir = None
+            if self._display:
+                self._display = False
+                virtual_display.release()
+
+
+class PlaywrightSession(BrowserSession):
+    """
+    Playwright会话，复用同一个浏览器进程，每个站点使用独立的浏览器上下文；
+    使用持久化配置时，关闭前将登录状态保存到配置目录
+    """
+
+    engine_name = "playwright"
+
+    def __init__(self, context: RunContext, browser_context, pid: Optional[int] = None, state_path: str = None):
+        super().__init__(context)
+        self.browser_context = browser_context
+        self.page = browser_context.pages[0] if browser_context.pages else browser_context.new_page()
+        # 浏览器进程，超时或取消时直接结束
+        self.pid = pid
+        self.state_path = state_path
+        self._closed = False
+        self._killed = False
+
+    def _timeout_ms(self, timeout: float) -> float:
+        return self.context.bounded(timeout) * 1000
+
+    def open(self, url: str):
+        self.page.goto(url, wait_until="domcontentloaded" if self.context.lean else "load",
+                       timeout=self._timeout_ms(self.context.page_load_timeout))
+
+    def refresh(self):
+        self.page.reload(timeout=self._timeout_ms(self.context.page_load_timeout))
+
+    @property
+    def current_url(self) -> str:
+        return self.page.url
+
+    @property
+    def page_source(self) -> str:
+        return self.page.content()
+
+    def inject_cookies(self, cookies: List[dict], url: str) -> bool:
+        root = site_root(url)
+        self.browser_context.clear_cookies()
+        self.browser_context.add_cookies(
+            [{"name": cookie["name"], "value": cookie["value"], "url": root} for cookie in cookies])
+        return True
+
+    def add_cookies(self, cookies: List[dict]) -> int:
+        self.inject_cookies(cookies, self.page.url)
+        return len(cookies)
+
+    def find_clickable(self, xpath: str):
+        locator = self.page.locator(f"xpath={xpath}")
+        for index in range(locator.count()):
+            element = locator.nth(index)
+            try:
+                if element.is_visible() and element.is_enabled():
+                    return element
+            except Exception:
+                continue
+        return None
+
+    def is_visible(self, xpath: str) -> bool:
+        try:
+            return self.page.locator(f"xpath={xpath}").first.is_visible()
+        except Exception:
+            return False
+
+    def execute_script(self, script: str):
+        return self.page.evaluate(f"() => {{{script}}}")
+
+    def save_screenshot(self, path: str):
+        self.page.screenshot(path=path)
+
+    def capture_screen(self):
+        # 使用页面截图，与页面内鼠标坐标一致，不依赖X显示
+        import cv2
+        import numpy as np
+        data = np.frombuffer(self.page.screenshot(), dtype=np.uint8)
+        return cv2.imdecode(data, cv2.IMREAD_GRAYSCALE)
+
+    def click_at(self, x: int, y: int):
+        self.page.mouse.move(x, y, steps=10)
+        self.page.mouse.click(x, y)
+        logger.info(f"已点击页面坐标 ({x}, {y})")
+
+    def kill(self):
+        """Playwright同步接口不能跨线程调用，直接结束浏览器进程，进行中的操作随即失败"""
+        self._killed = True
+        if browser_reaper.kill_tree(self.pid):
+            logger.warning(f"已结束Playwright浏览器进程（PID {self.pid}）")
+        else:
+            logger.warning("无法结束Playwright浏览器进程，会话将在当前操作超时后关闭")
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            if self.state_path and not self._killed:
+                self.browser_context.storage_state(path=self.state_path)
+            self.browser_context.close()
+        except Exception as e:
+            logger.debug(f"关闭浏览器上下文失败：{str(e)}")
+
+
+class BrowserEngine:
+    """
+    浏览器引擎，负责创建站点会话
+    """
+
+    name: str = ""
+    # 是否可以在多个线程中同时创建会话
+    thread_safe: bool = True
+    # 浏览器是否运行在本机：本机浏览器可以使用持久化浏览器配置，并受内存准入限制
+    local: bool = True
+
+    def new_session(self, handler) -> BrowserSession:
+        raise NotImplementedError
+
+    def close(self):
+        """运行结束时释放引擎资源"""
+        pass
+
+
+class SeleniumEngine(BrowserEngine):
+    """
+    Selenium引擎
+    """
+
+    name = "selenium"
+
+    @staticmethod
+    def chrome_options(handler, headless: bool, local: bool = True, extra_arguments: List[str] = None):
+        """Chrome启动参数，本地和远程浏览器共用；浏览器配置目录和低内存参数只用于本地浏览器"""
+        from selenium import webdriver
+
+        context = handler.context
+        chrome_options = webdriver.ChromeOptions()
+        chrome_options.add_argument("--disable-infobars")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option("useAutomationExtension", False)
+        arguments = handler.chrome_arguments + (extra_arguments or [])
+        if local:
+            arguments += memory_admission.arguments()
+        for argument in arguments:
+            chrome_options.add_argument(argument)
+        if local and handler.profile:
+            chrome_options.add_argument(f"--user-data-dir={handler.profile.path}")
+            chrome_options.add_argument(f"--disk-cache-size={handler.profile.cache_size}")
+        if context.lean:
+            apply_lean_options(chrome_options, headless=headless, block_images=handler.block_images)
+        elif headless:
+            chrome_options.add_argument("--headless=new")
+        return chrome_options
+
+    def new_session(self, handler) -> BrowserSession:
+        # 启动耗时包含首次使用时加载selenium的时间
+        start = time.monotonic()
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        context = handler.context
+        # 没有外部显示时，不依赖可见窗口的站点直接无头运行，需要窗口的站点使用私有虚拟显示
+        headless = handler.supports_headless and (context.lean or not virtual_display.external)
+        chrome_options = self.chrome_options(handler, headless)
+        cache_dir = None
+        if context.asset_cache and not handler.profile:
+            # 持久化配置自带磁盘缓存，临时配置使用共享的磁盘缓存目录
+            cache_dir = disk_cache_dirs.acquire()
+            if cache_dir:
+                chrome_options.add_argument(f"--disk-cache-dir={cache_dir}")
+                chrome_options.add_argument(
+                    f"--disk-cache-size={disk_cache_dirs.max_mb * 1024 * 1024 // disk_cache_dirs.max_dirs}")
+        display = None
+        if not headless and not virtual_display.external:
+            display = virtual_display.acquire()
+
+        logger.info("正在初始化ChromeDriver...")
+        try:
+            # 私有显示只传给chromedriver及其启动的浏览器
+            service = Service(ChromeDriverManager().install(), env=virtual_display.env(display) if display else None)
+            driver = webdriver.Chrome(service=service, options=chrome_options)
+        except Exception:
+            disk_cache_dirs.release(cache_dir)
+            if display:
+                virtual_display.release()
+            raise
+        session = SeleniumSession(context, driver, display=display is not None, cache_dir=cache_dir)
+        browser_reaper.track(session.pid, handler.site_name, session.kill)
+        try:
+            # 页面加载和脚本执行超时，避免driver.get无限阻塞
+            driver.set_page_load_timeout(context.bounded(context.page_load_timeout))
+            driver.set_script_timeout(context.bounded(context.script_timeout))
+            if context.lean:
+                block_requests(driver, context.blocked_hosts, block_images=handler.block_images)
+        except Exception:
+            session.close()
+            raise
+        session.setup_ms = int((time.monotonic() - start) * 1000)
+        logger.info("ChromeDriver初始化成功！")
+        return session
+
+
+class RemoteSession(SeleniumSession):
+    """
+    远程WebDriver会话：浏览器运行在其它节点，关闭时归还会话池，由后续站点复用
+    """
+
+    engine_name = "remote"
+
+    def __init__(self, context: RunContext, driver, engine: "RemoteEngine"):
+        super().__init__(context, driver)
+        self._engine = engine
+        self._released = False
+        # 访问过的源，归还会话池前清除其存储数据
+        self.origins = set()
+
+    def open(self, url: str):
+        self.origins.add(site_root(url).rstrip("/"))
+        super().open(url)
+
+    def kill(self):
+        """结束远程会话，不再归还会话池"""
+        if self._released:
+            return
+        self._released = True
+        quitter = threading.Thread(target=self._engine.discard, args=(self.driver,), daemon=True)
+        quitter.start()
+        quitter.join(10)
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._engine.release(self.driver, self.origins)
+
+
+class RemoteEngine(BrowserEngine):
+    """
+    远程WebDriver引擎（Selenium Grid或standalone-chrome）：浏览器运行在其它节点，不占用本机CPU和内存。
+    会话在单次运行内按站点复用，同时存在的会话数不超过会话池大小，并发由会话池控制，不占用本机浏览器槽位；
+    归还前清除全部Cookie、访问过的源的存储数据和请求屏蔽，清除失败的会话不再复用；
+    复用前检查会话是否可用，空闲过久（可能已被Grid回收）或检查失败的会话直接丢弃并重新创建
+    """
+
+    name = "remote"
+    # 浏览器运行在其它节点，不使用本机的浏览器配置目录，也不占用本机内存
+    local = False
+    # 空闲会话的复用期限（秒），小于Grid默认的会话超时
+    idle_timeout: float = 240
+    # 远程浏览器的默认窗口参数，视觉识别按页面截图坐标点击
+    default_arguments = ["--window-size=1200,800", "--force-device-scale-factor=1"]
+
+    def __init__(self, url: str, pool_size: int = 2):
+        self.url = url
+        self.pool_size = max(pool_size, 1)
+        self._cond = threading.Condition()
+        # 空闲会话及归还时间
+        self._idle: List[tuple] = []
+        # 已创建且未结束的会话数（使用中和空闲）
+        self._created = 0
+        self._closed = False
+        # 统计：新建和复用次数
+        self.creates = 0
+        self.reuses = 0
+
+    def new_session(self, handler) -> BrowserSession:
+        start = time.monotonic()
+        context = handler.context
+        driver = self._acquire(handler)
+        session = RemoteSession(context, driver, self)
+        try:
+            driver.set_page_load_timeout(context.bounded(context.page_load_timeout))
+            driver.set_script_timeout(context.bounded(context.script_timeout))
+            if context.lean:
+                block_requests(driver, context.blocked_hosts, block_images=handler.block_images)
+        except Exception:
+            session.kill()
+            raise
+        session.setup_ms = int((time.monotonic() - start) * 1000)
+        return session
+
+    def _acquire(self, handler):
+        """取出可用的空闲会话，没有时在会话池大小内新建，池满时等待其它站点归还"""
+        context = handler.context
+        while True:
+            candidate = None
+            with self._cond:
+                while True:
+                    context.check()
+                    if self._idle:
+                        candidate, released = self._idle.pop()
+                        if time.monotonic() - released > self.idle_timeout:
+                            self._created -= 1
+                            threading.Thread(target=self._quit, args=(candidate,), daemon=True).start()
+                            candidate = None
+                            continue
+                        break
+                    if self._created < self.pool_size:
+                        self._created += 1
+                        break
+                    self._cond.wait(1)
+            if candidate is None:
+                try:
+                    return self._create(handler)
+                except Exception:
+                    with self._cond:
+                        self._created -= 1
+                        self._cond.notify()
+                    raise
+            if self._healthy(candidate):
+                self.reuses += 1
+                logger.info(f"复用远程浏览器会话（已复用 {self.reuses} 次）")
+                return candidate
+            logger.info("远程浏览器会话不可用，重新创建")
+            self.discard(candidate)
+
+    def _create(self, handler):
+        from selenium import webdriver
+
+        # 远程节点自带显示，只有轻量模式下不需要窗口的站点使用无头模式
+        options = SeleniumEngine.chrome_options(handler, headless=handler.supports_headless and handler.context.lean,
+                                                local=False, extra_arguments=self.default_arguments)
+        logger.info(f"正在连接远程WebDriver：{self.url}")
+        driver = webdriver.Remote(command_executor=self.url, options=options)
+        self.creates += 1
+        logger.info("远程浏览器会话已创建")
+        return driver
+
+    @staticmethod
+    def _healthy(driver) -> bool:
+        """会话仍可执行命令，并回到空白页"""
+        try:
+            driver.get("about:blank")
+            return driver.execute_script("return 1") == 1
+        except Exception as e:
+            logger.debug(f"远程浏览器会话检查失败：{str(e)}")
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.debug(f"关闭远程浏览器会话失败：{str(e)}")
+
+    @staticmethod
+    def _reset(driver, origins) -> bool:
+        """清除会话中全部站点的登录状态和本站点设置的请求屏蔽，避免泄露给后续站点或账号"""
+        try:
+            current = driver.current_url
+            if current.startswith("http"):
+                origins = set(origins) | {site_root(current).rstrip("/")}
+            execute_cdp(driver, "Network.clearBrowserCookies")
+            execute_cdp(driver, "Network.setBlockedURLs", {"urls": []})
+            for origin in origins:
+                execute_cdp(driver, "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            logger.debug(f"清除远程浏览器会话数据失败：{str(e)}")
+            return False
+
+    def release(self, driver, origins=()):
+        """站点完成后清除会话数据并归还，无法清除时结束会话"""
+        with self._cond:
+            closed = self._closed
+        if closed or not self._reset(driver, origins):
+            self.discard(driver)
+            return
+        with self._cond:
+            if not self._closed:
+                self._idle.append((driver, time.monotonic()))
+                self._cond.notify()
+                return
+        self.discard(driver)
+
+    def discard(self, driver):
+        """结束不可再用的会话"""
+        self._quit(driver)
+        with self._cond:
+            self._created -= 1
+            self._cond.notify()
+
+    def close(self):
+        """运行结束，结束全部空闲会话，使用中的会话在归还时结束"""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+        for driver, _ in idle:
+            self._quit(driver)
+        if self.creates or self.reuses:
+            logger.info(f"远程浏览器会话新建 {self.creates} 次，复用 {self.reuses} 次")
+
+
+class PlaywrightEngine(BrowserEngine):
+    """
+    Playwright引擎：单次运行内复用一个Chromium进程，站点之间使用毫秒级创建的独立上下文；
+    持久化配置只保存Cookie和LocalStorage，从同一个浏览器创建上下文，不为每个站点启动浏览器；
+    视觉识别使用页面截图和页面内点击，浏览器始终以无头模式运行，不需要X显示
+    """
+
+    name = "playwright"
+    # 同步接口绑定创建它的线程，同一次运行内的会话需要在同一线程中创建
+    thread_safe = False
+
+    # 默认启动参数
+    launch_arguments = [
+        "--disable-gpu",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--disable-blink-features=AutomationControlled",
+    ]
+    # 轻量模式下屏蔽的资源类型
+    blocked_resource_types = {"image", "media", "font"}
+    # 浏览器进程名称
+    browser_names = ("chrom", "headless_shell")
+    # 持久化配置中保存登录状态的文件
+    state_name = "playwright_state.json"
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._browser_pid: Optional[int] = None
+        # Playwright同步接口绑定创建它的线程
+        self._thread = None
+        # Playwright驱动进程，浏览器进程都是它的子进程
+        self._pids: List[int] = []
+
+    def _start_playwright(self):
+        from playwright.sync_api import sync_playwright
+        before = browser_reaper.child_pids()
+        self._playwright = sync_playwright().start()
+        self._thread = threading.get_ident()
+        self._pids = browser_reaper.track_new(before, ("node", "playwright"), "Playwright")
+
+    def _ensure_browser(self):
+        if self._browser and self._thread == threading.get_ident():
+            if self._browser.is_connected():
+                return self._browser
+            # 浏览器进程已被结束，同一线程内重新启动浏览器
+            self._browser = None
+        else:
+            self.close()
+            self._start_playwright()
+        before = browser_reaper.children(self._pids, self.browser_names)
+        self._browser = self._playwright.chromium.launch(
+            headless=True, args=self.launch_arguments + memory_admission.arguments())
+        started = browser_reaper.children(self._pids, self.browser_names) - before
+        self._browser_pid = next(iter(started), None)
+        logger.info("Playwright浏览器已启动（无头模式）")
+        return self._browser
+
+    def _route(self, context: RunContext, block_images: bool):
+        """轻量模式屏蔽资源和第三方域名，启用资源缓存时静态资源经由共享缓存"""
+        hosts = []
+        resource_types = set()
+        if context.lean:
+            blocked_hosts = context.blocked_hosts
+            hosts = [host for host in (blocked_hosts if blocked_hosts is not None else DEFAULT_BLOCKED_HOSTS) if host]
+            resource_types = set(self.blocked_resource_types)
+            if not block_images:
+                resource_types.discard("image")
+
+        def _handle(route):
+            request = route.request
+            if request.resource_type in resource_types or any(host in request.url for host in hosts):
+                route.abort()
+            elif context.asset_cache and request.method == "GET" \
+                    and request.resource_type in asset_cache.resource_types:
+                self._fulfill_cached(route)
+            else:
+                route.continue_()
+
+        return _handle
+
+    @staticmethod
+    def _fulfill_cached(route):
+        """命中缓存时直接返回缓存内容，否则请求后按响应头缓存"""
+        url = route.request.url
+        entry = asset_cache.get(url)
+        if entry:
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=entry["body"])
+            return
+        try:
+            response = route.fetch()
+            body = response.body()
+        except Exception as e:
+            logger.debug(f"请求静态资源失败：{url} - {str(e)}")
+            route.continue_()
+            return
+        asset_cache.put(url, response.status, response.headers, body)
+        route.fulfill(response=response, body=body)
+
+    def new_session(self, handler) -> BrowserSession:
+        context = handler.context
+        start = time.monotonic()
+        options = {
+            "viewport": {"width": 1200, "height": 800},
+            "device_scale_factor": 1,
+        }
+        state_path = None
+        if handler.profile:
+            # 持久化配置保存上次的登录状态，没有保存时重新注入Cookie
+            state_path = str(handler.profile.path / self.state_name)
+            if os.path.exists(state_path):
+                options["storage_state"] = state_path
+            else:
+                handler.profile.invalidate()
+        browser_context = self._ensure_browser().new_context(**options)
+        browser_context.set_default_timeout(context.bounded(context.script_timeout) * 1000)
+        if context.lean or context.asset_cache:
+            browser_context.route("**/*", self._route(context, handler.block_images))
+        session = PlaywrightSession(context, browser_context, pid=self._browser_pid, state_path=state_path)
+        session.setup_ms = int((time.monotonic() - start) * 1000)
+        logger.info(f"Playwright浏览器上下文已创建，耗时 {session.setup_ms} ms")
+        return session
+
+    def close(self):
+        try:
+            if self._browser:
+                self._browser.close()
+            if self._playwright:
+                self._playwright.stop()
+        except Exception as e:
+            logger.debug(f"关闭Playwright失败：{str(e)}")
+        finally:
+            self._browser = None
+            self._browser_pid = None
+            self._playwright = None
+            self._thread = None
+            for pid in self._pids:
+                browser_reaper.release(pid)
+            self._pids = []
+
+
+def create_engine(name: str, remote_url: str = "", pool_size: int = 2) -> BrowserEngine:
+    """
+    按名称创建浏览器引擎，Playwright未安装或未配置远程地址时使用Selenium
+    """
+    if name == RemoteEngine.name:
+        if remote_url:
+            return RemoteEngine(remote_url, pool_size)
+        logger.warning("未配置远程WebDriver地址，使用Selenium引擎")
+    if name == PlaywrightEngine.name:
+        try:
+            import playwright.sync_api  # noqa: F401
+            return PlaywrightEngine()
+        except ImportError:
+            logger.warning("未安装playwright，使用Selenium引擎")
+    return SeleniumEngine()
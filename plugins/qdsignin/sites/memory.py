@@ -0,0 +1,99 @@
+import os
+import threading
+from typing import List, Optional
+
+from app.log import logger
+
+# 低内存模式下的Chrome启动参数：限制渲染进程数、关闭站点隔离和后台网络、缩小磁盘缓存和V8堆
+LOW_MEMORY_ARGUMENTS = [
+    "--renderer-process-limit=1",
+    "--disable-site-isolation-trials",
+    "--disable-features=site-per-process,TranslateUI",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--js-flags=--max-old-space-size=256",
+]
+
+
+class MemoryAdmission:
+    """
+    浏览器内存准入：按观测到的单个浏览器内存占用估算启动成本，
+    只有启动后可用内存仍高于保留值时才允许启动新的浏览器；没有运行中的浏览器时总是允许，避免无法推进
+    """
+
+    # 没有观测数据时单个浏览器的估算占用（MB）
+    default_estimate_mb: int = 350
+    # 指数滑动平均权重
+    alpha: float = 0.3
+    # 物理内存低于该值（MB）的主机总是使用低内存参数
+    small_host_mb: int = 4096
+
+    def __init__(self):
+        # 启动浏览器后需要保留的可用内存（MB），0为不限制
+        self.reserve_mb = 512
+        self.estimate_mb = self.default_estimate_mb
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _memory():
+        """系统内存信息，psutil不可用时返回None"""
+        try:
+            import psutil
+            return psutil.virtual_memory()
+        except Exception:
+            return None
+
+    def available_mb(self) -> Optional[int]:
+        memory = self._memory()
+        return memory.available // 1024 // 1024 if memory else None
+
+    def total_mb(self) -> Optional[int]:
+        memory = self._memory()
+        return memory.total // 1024 // 1024 if memory else None
+
+    def observe(self, rss_mb: int):
+        """记录一个浏览器的峰值内存占用"""
+        if rss_mb <= 0:
+            return
+        with self._lock:
+            self.estimate_mb = int(self.alpha * rss_mb + (1 - self.alpha) * self.estimate_mb)
+
+    def admits(self, in_use: int) -> bool:
+        """当前是否可以再启动一个浏览器"""
+        if not self.reserve_mb or in_use <= 0:
+            return True
+        available = self.available_mb()
+        if available is None:
+            return True
+        return available - self.estimate_mb >= self.reserve_mb
+
+    def capacity(self) -> int:
+        """按总内存和CPU数估算主机可同时运行的浏览器数量，用于自动并发"""
+        cpus = os.cpu_count() or 1
+        total = self.total_mb()
+        if total is None:
+            return 1
+        return max(min((total - self.reserve_mb) // max(self.estimate_mb, 1), cpus), 1)
+
+    def under_pressure(self) -> bool:
+        """可用内存不足以再启动一个浏览器"""
+        if not self.reserve_mb:
+            return False
+        available = self.available_mb()
+        return available is not None and available - self.estimate_mb < self.reserve_mb
+
+    def low_memory(self) -> bool:
+        """小内存主机或内存紧张时使用低内存启动参数"""
+        total = self.total_mb()
+        return (total is not None and total < self.small_host_mb) or self.under_pressure()
+
+    def arguments(self) -> List[str]:
+        """新浏览器需要追加的启动参数"""
+        if not self.low_memory():
+            return []
+        logger.debug(f"使用低内存浏览器参数，可用内存 {self.available_mb()} MB，单个浏览器估算 {self.estimate_mb} MB")
+        return list(LOW_MEMORY_ARGUMENTS)
+
+
+# 插件内所有浏览器共享的内存准入
+memory_admission = MemoryAdmission()
@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from .classifier import ALREADY, ERROR, SUCCESS
+from .profile import MODE_HTTP
+
+# NexusPHP站点签到配置：请求attendance.php即完成签到
+NEXUS_PROFILE: dict = {
+    "mode": MODE_HTTP,
+    "signin_url": "attendance.php",
+    "retries": 2,
+    "markers": {
+        SUCCESS: ["签到成功", "簽到成功", "这是您的第", "這是您的第"],
+        ALREADY: ["今天已签到", "今日已签到", "已经签到", "您今天已经签到过了", "已簽到", "already"],
+        ERROR: ["签到失败", "簽到失敗"],
+    },
+}
+
+# 页面中可识别为NexusPHP的特征
+NEXUS_MARKS = ["nexusphp", "userdetails.php?id=", "torrents.php"]
+
+
+def create_http_session(pool_size: int):
+    """
+    批量签到共用的HTTP会话，连接池大小与并发数一致，同一站点的请求复用连接
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fingerprint(url: str, cookie: str, ua: str = None, proxies: dict = None,
+                session=None, timeout: float = 30) -> dict:
+    """
+    访问站点首页识别是否为NexusPHP站点及是否提供attendance.php签到
+    """
+    from app.utils.http import RequestUtils
+
+    res = RequestUtils(cookies=cookie, ua=ua, proxies=proxies, session=session, timeout=timeout).get_res(url)
+    if res is None:
+        raise ConnectionError(f"无法访问 {url}")
+    if "login" in res.url:
+        return {"login": True}
+    text = res.text.lower()
+    return {
+        "nexusphp": any(mark in text for mark in NEXUS_MARKS),
+        "attendance": "attendance.php" in text
+    }
+
+
+class FingerprintCache:
+    """
+    站点类型识别结果缓存，按域名保存，超过有效期后重新识别
+    """
+
+    # 有效期（天）
+    ttl_days: int = 7
+
+    def __init__(self, data: Optional[Dict[str, dict]] = None):
+        self.data: Dict[str, dict] = data or {}
+
+    def get(self, domain: str) -> Optional[dict]:
+        item = self.data.get(domain)
+        if not item:
+            return None
+        checked = item.get("checked") or ""
+        if checked < (datetime.now() - timedelta(days=self.ttl_days)).strftime("%Y-%m-%d"):
+            return None
+        return item
+
+    def set(self, domain: str, result: dict):
+        self.data[domain] = {**result, "checked": datetime.now().strftime("%Y-%m-%d")}
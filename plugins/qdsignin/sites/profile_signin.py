@@ -0,0 +1,244 @@
+import os
+import time
+from typing import Optional
+
+from app.log import logger
+
+from .base import BaseSignin
+from .classifier import ALREADY, ERROR, LOGIN, SUCCESS
+from .engine import BrowserSession
+from .profile import MODE_HTTP, STEP_CLICK, STEP_POLL, STEP_SLEEP, STEP_VISUAL, SiteProfile
+from .ratelimit import host_limiter
+from .runtime import RunContext
+
+# 已加载的视觉模板
+_templates = {}
+
+
+def _load_template(path: str):
+    """加载灰度模板图片，同一模板只读取一次"""
+    if path not in _templates:
+        import cv2
+        if not os.path.exists(path):
+            logger.warning(f"模板图片未找到：{path}")
+            return None
+        template = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+        if template is None:
+            logger.warning(f"无法加载模板图片：{path}")
+            return None
+        _templates[path] = template
+    return _templates[path]
+
+
+class ProfileSignin(BaseSignin):
+    """
+    按站点配置执行签到，所有站点共用浏览器初始化、Cookie注入、重试和结果识别流程
+    """
+
+    def __init__(self, site_profile: SiteProfile, cookie_string: str = "", context: RunContext = None,
+                 account: str = ""):
+        super().__init__(context)
+        self.site_profile = site_profile
+        # 附加账号使用独立的名称，浏览器配置、选择器记录和日志按账号区分
+        self.site_name = f"{site_profile.name}@{account}" if account else site_profile.name
+        self.site_url = site_profile.url
+        self.cookie_string = cookie_string
+        self.chrome_arguments = site_profile.chrome_arguments
+        self.classifier = site_profile.classifier
+        # 视觉识别依赖可见窗口和页面图片
+        self.supports_headless = not site_profile.visual
+        self.block_images = not site_profile.visual
+        # HTTP方式使用的UA和代理，为空时使用系统默认
+        self.ua = None
+        self.proxies = None
+
+    def _signin(self) -> dict:
+        """
+        执行签到，出错时按配置的次数重试
+        """
+        if not self.cookie_string:
+            logger.error("Cookie字符串为空")
+            return {"success": False, "message": "Cookie字符串为空"}
+        if not self.site_url:
+            return {"success": False, "message": "站点域名未配置"}
+
+        max_retries = self.site_profile.retries
+        retry_count = 0
+        while retry_count < max_retries:
+            try:
+                if self.site_profile.mode == MODE_HTTP:
+                    return self._signin_http()
+                return self._signin_browser()
+            except Exception as e:
+                # 超时或取消导致的异常不再重试
+                self.context.check()
+                logger.error(f"{self.site_name}站点签到出现错误：{str(e)}")
+                retry_count += 1
+                if retry_count >= max_retries:
+                    return {"success": False, "message": f"签到失败，已重试{max_retries}次：{str(e)}"}
+
+                logger.info(f"等待{5 * retry_count}秒后第{retry_count}次重试...")
+                self.sleep(5 * retry_count)
+
+        return {"success": False, "message": "签到失败，已达到最大重试次数"}
+
+    def _signin_http(self) -> dict:
+        """
+        直接请求签到地址，不启动浏览器
+        """
+        from app.core.config import settings
+        from app.utils.http import RequestUtils
+
+        self.context.check()
+        host_limiter.acquire(self.site_profile.signin_url, self.context)
+        res = RequestUtils(cookies=self.cookie_string, ua=self.ua or settings.USER_AGENT, proxies=self.proxies,
+                           session=self.context.http_session,
+                           timeout=self.context.bounded(30)).get_res(self.site_profile.signin_url)
+        if res is None:
+            raise ConnectionError(f"无法访问 {self.site_profile.signin_url}")
+        logger.info(f"已请求{self.site_name}签到地址，HTTP {res.status_code}")
+        if self.site_profile.check_login and self.site_profile.login_url in res.url:
+            return self._login_required()
+        return self._result(*self._classify(res.text))
+
+    def _signin_browser(self) -> dict:
+        """
+        使用浏览器依次执行配置的步骤
+        """
+        session = None
+        watchdog = None
+        try:
+            session = self.setup_driver()
+            watchdog = self.watch(session)
+
+            if not self.open_site(session, self.site_url):
+                return {"success": False, "message": "Cookie加载失败"}
+
+            if self.site_profile.check_login:
+                if self.site_profile.login_url in session.current_url.lower() \
+                        or self.classify_page(session)[0] == LOGIN:
+                    return self._login_required()
+
+            for index, step in enumerate(self.site_profile.steps):
+                result = self._run_step(session, index, step)
+                if result:
+                    return result
+
+            if self.site_profile.screenshot:
+                self._save_screenshot(session)
+            if not self.classifier:
+                logger.info(f"{self.site_name}站点签到成功！")
+                return {"success": True, "message": "签到成功"}
+            return self._result(*self.classify_page(session))
+
+        finally:
+            if watchdog:
+                watchdog.stop()
+            if session:
+                self.quit_driver(session)
+
+    def _run_step(self, session: BrowserSession, index: int, step: dict) -> Optional[dict]:
+        """
+        执行单个步骤，步骤决定了签到结果时返回结果，否则返回None继续
+        """
+        step_type = step["type"]
+        if step_type == STEP_SLEEP:
+            self.sleep(step["seconds"])
+        elif step_type == STEP_CLICK:
+            # 多个候选选择器时按历史命中记录排序，上次命中的优先尝试
+            selectors = self.context.selectors if len(step["xpaths"]) > 1 else None
+            xpaths = selectors.order(self.site_name, str(index), step["xpaths"]) if selectors else step["xpaths"]
+            try:
+                element, xpath = self.wait_any_clickable(session, xpaths, step["timeout"])
+            except TimeoutError:
+                if selectors:
+                    selectors.record(self.site_name, str(index), xpaths, None)
+                # 没有可点击的元素时检查是否已经签到
+                if self.classify_page(session)[0] == ALREADY:
+                    logger.info(f"{self.site_name}站点今日已签到")
+                    return {"success": True, "message": "今日已签到"}
+                logger.warning(f"{self.site_name}站点{step['message']}")
+                return {"success": False, "message": step["message"]}
+            if selectors:
+                selectors.record(self.site_name, str(index), xpaths, xpath)
+            element.click()
+            logger.info(f"已点击{self.site_name}站点元素：{xpath}")
+            if step["wait"]:
+                self.sleep(step["wait"])
+        elif step_type == STEP_VISUAL:
+            # 页面截图匹配模板，在页面内点击，多个站点同时签到时互不影响
+            position = self._locate(session, step)
+            if position:
+                session.click_at(*position)
+            else:
+                logger.warning(f"{self.site_name}站点{step['message']}")
+                return {"success": False, "message": step["message"]}
+        elif step_type == STEP_POLL:
+            deadline = time.monotonic() + self.context.bounded(step["timeout"])
+            logger.info(f"开始等待{step['timeout']:.0f}秒，期间每隔{step['interval']:.0f}秒检查一次签到结果...")
+            while time.monotonic() < deadline:
+                if step["scroll"]:
+                    session.execute_script(f"window.scrollBy(0, {step['scroll']});")
+                if session.is_visible(step["xpath"]):
+                    logger.info(f"{self.site_name}站点签到成功！")
+                    return {"success": True, "message": "签到成功"}
+                self.sleep(step["interval"])
+            logger.warning(f"{self.site_name}站点{step['message']}")
+            return {"success": False, "message": step["message"]}
+        return None
+
+    def _locate(self, session: BrowserSession, step: dict):
+        """视觉检测模板位置，返回中心坐标"""
+        import cv2
+
+        template = _load_template(step["template"])
+        if template is None:
+            return None
+        h, w = template.shape
+        for _ in range(step["retries"]):
+            try:
+                screenshot = session.capture_screen()
+                res = cv2.matchTemplate(screenshot, template, cv2.TM_CCOEFF_NORMED)
+                _, max_val, _, max_loc = cv2.minMaxLoc(res)
+                logger.debug(f"匹配结果：max_val={max_val:.4f}, 阈值={step['threshold']}")
+                if max_val >= step["threshold"]:
+                    return max_loc[0] + w // 2, max_loc[1] + h // 2
+                self.sleep(1)
+            except Exception as e:
+                self.context.check()
+                logger.warning(f"视觉检测失败：{str(e)}")
+        return None
+
+    def _save_screenshot(self, session: BrowserSession):
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        screenshot_path = os.path.join(os.path.dirname(__file__), "..",
+                                       f"{self.site_name.lower()}_result_{timestamp}.png")
+        session.save_screenshot(screenshot_path)
+        logger.info(f"已保存操作结果截图: {screenshot_path}")
+
+    def _classify(self, text: str):
+        if not self.classifier:
+            return None, None
+        return self.classifier.classify(text)
+
+    def _login_required(self) -> dict:
+        logger.error("Cookie已失效，需要重新登录")
+        return {"success": False, "message": "Cookie已失效，需要重新登录"}
+
+    def _result(self, text_class: Optional[str], marker: Optional[str]) -> dict:
+        """按页面文本类别生成签到结果"""
+        if self.context.selectors:
+            self.context.selectors.record_marker(self.site_name, text_class, marker)
+        if text_class == SUCCESS:
+            logger.info(f"{self.site_name}站点签到成功！")
+            return {"success": True, "message": "签到成功"}
+        if text_class == ALREADY:
+            logger.info(f"{self.site_name}站点今日已签到")
+            return {"success": True, "message": "今日已签到"}
+        if text_class == ERROR:
+            logger.warning(f"{self.site_name}站点签到失败：{marker}")
+            return {"success": False, "message": f"签到失败：{marker}"}
+        if text_class == LOGIN:
+            return self._login_required()
+        logger.warning("签到状态未知")
+        return {"success": False, "message": "签到状态未知"}
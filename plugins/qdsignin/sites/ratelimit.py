@@ -0,0 +1,63 @@
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlparse
+
+from app.log import logger
+
+from .runtime import RunContext
+
+
+class HostRateLimiter:
+    """
+    按域名的令牌桶限速：浏览器访问、HTTP签到、重试和站点识别请求共用，
+    不同域名的请求互不等待，同一域名的请求间隔不小于interval秒，允许burst个请求连续发出。
+    令牌不足时先预约再等待，同一域名的并发请求按到达顺序依次放行
+    """
+
+    def __init__(self, interval: float = 5, burst: int = 1):
+        self.interval = interval
+        self.burst = max(burst, 1)
+        # 域名 -> [剩余令牌数, 上次补充时间]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, interval: float, burst: int):
+        with self._lock:
+            self.interval = max(interval, 0)
+            self.burst = max(burst, 1)
+            self._buckets.clear()
+
+    @staticmethod
+    def host(url: str) -> str:
+        if "://" not in url:
+            url = f"https://{url}"
+        return (urlparse(url).hostname or "").lower()
+
+    def reserve(self, url: str) -> float:
+        """预约一个令牌，返回需要等待的秒数"""
+        host = self.host(url)
+        if not self.interval or not host:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._buckets.setdefault(host, [float(self.burst), now])
+            bucket[0] = min(bucket[0] + (now - bucket[1]) / self.interval, float(self.burst))
+            bucket[1] = now
+            bucket[0] -= 1
+            return -bucket[0] * self.interval if bucket[0] < 0 else 0
+
+    def acquire(self, url: str, context: RunContext = None) -> float:
+        """等待到可以请求该域名，等待期间响应取消和超时，返回等待的秒数"""
+        wait = self.reserve(url)
+        if wait > 0:
+            logger.debug(f"{self.host(url)} 请求过于频繁，等待 {wait:.1f} 秒")
+            if context:
+                context.sleep(wait)
+            else:
+                time.sleep(wait)
+        return wait
+
+
+# 插件内所有请求共享的域名限速
+host_limiter = HostRateLimiter()
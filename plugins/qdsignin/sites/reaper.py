@@ -0,0 +1,304 @@
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+
+from app.log import logger
+
+from .memory import memory_admission
+
+
+def _psutil():
+    """psutil随MoviePilot安装，缺失时不做进程看守"""
+    try:
+        import psutil
+        return psutil
+    except ImportError:
+        return None
+
+
+class BrowserReaper:
+    """
+    浏览器进程看守：登记插件启动的每个浏览器进程树，定期检查内存占用和存活时间，超出上限时强制结束；
+    会话关闭后仍未退出的进程、运行结束和插件初始化时残留的进程一并结束。
+    进程记录保存到文件，MoviePilot重启后仍可清理上一次遗留的进程
+    """
+
+    # 检查间隔（秒）
+    interval: float = 5
+    # 会话关闭后等待进程自行退出的时间（秒）
+    grace: float = 5
+
+    def __init__(self):
+        # 单个浏览器进程树的内存上限（MB）和存活上限（秒），0为不限制
+        self.max_rss_mb = 1024
+        self.max_lifetime = 900
+        self.state_file: Optional[Path] = None
+        self._lock = threading.Lock()
+        # 根进程PID -> {"site", "started", "kill", "pids": {PID: 创建时间}}
+        self._active: Dict[int, dict] = {}
+        # 已关闭会话的进程：PID -> (创建时间, 关闭时间, 站点)
+        self._closed: Dict[int, tuple] = {}
+        self._monitor: Optional[threading.Thread] = None
+        # 本进程内累计结束的进程
+        self.reaped: List[dict] = []
+
+    def configure(self, state_file: Optional[Path] = None, max_rss_mb: int = None, max_lifetime: int = None):
+        with self._lock:
+            if state_file is not None:
+                self.state_file = Path(state_file)
+            if max_rss_mb is not None:
+                self.max_rss_mb = max_rss_mb
+            if max_lifetime is not None:
+                self.max_lifetime = max_lifetime
+
+    @staticmethod
+    def child_pids() -> Set[int]:
+        """当前进程的直接子进程"""
+        psutil = _psutil()
+        if not psutil:
+            return set()
+        try:
+            return {child.pid for child in psutil.Process().children()}
+        except Exception:
+            return set()
+
+    @staticmethod
+    def children(pids: List[int], names: tuple) -> Set[int]:
+        """指定进程的直接子进程中名称匹配的进程"""
+        psutil = _psutil()
+        if not psutil:
+            return set()
+        children = set()
+        for pid in pids:
+            try:
+                children.update(child.pid for child in psutil.Process(pid).children()
+                                if any(name in child.name().lower() for name in names))
+            except Exception:
+                continue
+        return children
+
+    @staticmethod
+    def kill_tree(pid: Optional[int]) -> bool:
+        """结束进程及其全部子进程，用于中止无法跨线程关闭的浏览器"""
+        psutil = _psutil()
+        if not psutil or not pid:
+            return False
+        try:
+            process = psutil.Process(pid)
+            processes = process.children(recursive=True) + [process]
+        except Exception:
+            return False
+        for process in processes:
+            try:
+                process.kill()
+            except Exception:
+                continue
+        return True
+
+    def track_new(self, before: Set[int], names: tuple, site: str = "") -> List[int]:
+        """
+        登记启动浏览器后新出现的、名称匹配的直接子进程，用于不暴露进程号的引擎；
+        这类进程在整个运行内复用，只限制内存不限制存活时间
+        """
+        psutil = _psutil()
+        if not psutil:
+            return []
+        pids = []
+        for pid in self.child_pids() - before:
+            try:
+                if any(name in psutil.Process(pid).name().lower() for name in names):
+                    self.track(pid, site, limit_lifetime=False)
+                    pids.append(pid)
+            except Exception:
+                continue
+        return pids
+
+    def track(self, pid: Optional[int], site: str = "", kill: Callable[[], None] = None,
+              limit_lifetime: bool = True):
+        """
+        登记浏览器根进程（chromedriver或浏览器驱动进程），kill为超限时优先调用的结束方式
+        """
+        psutil = _psutil()
+        if not psutil or not pid:
+            return
+        try:
+            create_time = psutil.Process(pid).create_time()
+        except Exception:
+            return
+        with self._lock:
+            self._active[pid] = {"site": site, "started": time.monotonic(), "kill": kill,
+                                 "limit_lifetime": limit_lifetime, "pids": {pid: create_time}}
+            self._refresh(self._active[pid])
+            self._save()
+            self._ensure_monitor()
+
+    def release(self, pid: Optional[int]):
+        """会话已关闭，进程树在宽限时间后仍存在时结束"""
+        if not pid:
+            return
+        with self._lock:
+            entry = self._active.pop(pid, None)
+            if not entry:
+                return
+            if entry.get("peak_mb"):
+                # 按峰值内存更新单个浏览器的估算占用
+                memory_admission.observe(entry["peak_mb"])
+            self._refresh(entry)
+            now = time.monotonic()
+            for child, create_time in entry["pids"].items():
+                self._closed[child] = (create_time, now, entry["site"])
+            self._save()
+            self._ensure_monitor()
+
+    def reap(self, reason: str = "运行结束") -> List[dict]:
+        """
+        结束已关闭会话的残留进程和上次运行遗留的进程，返回结束的进程；
+        只处理插件登记过的进程，不影响MoviePilot或其它插件启动的浏览器
+        """
+        psutil = _psutil()
+        if not psutil:
+            return []
+        with self._lock:
+            active = {pid for entry in self._active.values() for pid in entry["pids"]}
+            candidates = {pid: (create_time, site) for pid, (create_time, _, site) in self._closed.items()}
+            for pid, create_time in self._load().items():
+                if pid not in active:
+                    candidates.setdefault(pid, (create_time, ""))
+            reaped = []
+            for pid, (create_time, site) in candidates.items():
+                record = self._kill(pid, create_time, reason, site)
+                if record:
+                    reaped.append(record)
+            self._closed.clear()
+            self._save()
+        for record in reaped:
+            logger.info(f"已结束残留浏览器进程 {record['name']}（PID {record['pid']}，"
+                        f"{record['rss_mb']} MB）：{reason}")
+        return reaped
+
+    def _ensure_monitor(self):
+        if self._monitor and self._monitor.is_alive():
+            return
+        self._monitor = threading.Thread(target=self._watch, name="qdsignin-reaper", daemon=True)
+        self._monitor.start()
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active and not self._closed:
+                    self._monitor = None
+                    return
+                overdue = self._check_closed()
+                violations = self._check_active()
+            for entry, reason in violations:
+                self._terminate(entry, reason)
+            if overdue or violations:
+                with self._lock:
+                    self._save()
+
+    def _check_closed(self) -> List[dict]:
+        """结束关闭后超过宽限时间仍未退出的进程"""
+        now = time.monotonic()
+        overdue = [pid for pid, (_, closed, _) in self._closed.items() if now - closed >= self.grace]
+        reaped = []
+        for pid in overdue:
+            create_time, _, site = self._closed.pop(pid)
+            record = self._kill(pid, create_time, "会话关闭后未退出", site)
+            if record:
+                logger.warning(f"{site}浏览器进程 {record['name']}（PID {pid}）关闭后未退出，已强制结束")
+                reaped.append(record)
+        return reaped
+
+    def _check_active(self) -> List[tuple]:
+        """记录各浏览器的峰值内存，找出超出内存或存活上限的浏览器"""
+        psutil = _psutil()
+        now = time.monotonic()
+        violations = []
+        for pid, entry in list(self._active.items()):
+            self._refresh(entry)
+            if self.max_lifetime and entry["limit_lifetime"] and now - entry["started"] > self.max_lifetime:
+                violations.append((self._active.pop(pid), f"超出存活上限{self.max_lifetime}秒"))
+                continue
+            rss = 0
+            for child in entry["pids"]:
+                try:
+                    rss += psutil.Process(child).memory_info().rss
+                except Exception:
+                    continue
+            entry["peak_mb"] = max(entry.get("peak_mb", 0), rss // 1024 // 1024)
+            if self.max_rss_mb and rss > self.max_rss_mb * 1024 * 1024:
+                violations.append((self._active.pop(pid), f"内存占用{rss // 1024 // 1024} MB超出上限"))
+        return violations
+
+    def _terminate(self, entry: dict, reason: str):
+        """先按会话方式关闭，再结束进程树中剩余的进程"""
+        logger.warning(f"{entry['site']}浏览器{reason}，强制结束")
+        if entry["kill"]:
+            try:
+                entry["kill"]()
+            except Exception as e:
+                logger.debug(f"关闭浏览器会话失败：{str(e)}")
+        with self._lock:
+            for pid, create_time in entry["pids"].items():
+                self._kill(pid, create_time, reason, entry["site"])
+
+    def _refresh(self, entry: dict):
+        """记录进程树中新出现的子进程，根进程退出后子进程可能被重新挂到其它父进程下"""
+        psutil = _psutil()
+        for pid in list(entry["pids"]):
+            try:
+                for child in psutil.Process(pid).children(recursive=True):
+                    entry["pids"].setdefault(child.pid, child.create_time())
+            except Exception:
+                continue
+
+    def _kill(self, pid: int, create_time: float, reason: str, site: str = "") -> Optional[dict]:
+        """结束仍存在的进程，PID已被其它进程复用时跳过"""
+        psutil = _psutil()
+        try:
+            process = psutil.Process(pid)
+            if abs(process.create_time() - create_time) > 1 or process.status() == psutil.STATUS_ZOMBIE:
+                return None
+            record = {
+                "pid": pid,
+                "name": process.name(),
+                "site": site,
+                "rss_mb": process.memory_info().rss // 1024 // 1024,
+                "reason": reason
+            }
+            process.kill()
+        except Exception:
+            return None
+        self.reaped.append(record)
+        return record
+
+    def _load(self) -> Dict[int, float]:
+        if not self.state_file or not self.state_file.exists():
+            return {}
+        try:
+            return {int(pid): create_time for pid, create_time in json.loads(self.state_file.read_text()).items()}
+        except Exception as e:
+            logger.debug(f"读取浏览器进程记录失败：{str(e)}")
+            return {}
+
+    def _save(self):
+        """保存全部已登记的进程，重启后用于清理"""
+        if not self.state_file:
+            return
+        pids = {pid: create_time for entry in self._active.values() for pid, create_time in entry["pids"].items()}
+        pids.update({pid: create_time for pid, (create_time, _, _) in self._closed.items()})
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(pids))
+            os.replace(tmp, self.state_file)
+        except OSError as e:
+            logger.debug(f"保存浏览器进程记录失败：{str(e)}")
+
+
+# 插件内所有浏览器共享的进程看守
+browser_reaper = BrowserReaper()
@@ -0,0 +1,231 @@
+import time
+import threading
+from typing import Callable, List, Optional
+
+from app.log import logger
+
+from .memory import memory_admission
+
+
+class SigninCancelled(Exception):
+    """
+    签到被取消或超出时间预算
+    """
+    pass
+
+
+class CancelToken:
+    """
+    协作式取消令牌，插件停止/重载时触发，所有等待都会检查该令牌
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason = ""
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "任务已取消"):
+        """触发取消并执行已注册的回调"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks = list(self._callbacks)
+            self._callbacks.clear()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"执行取消回调失败：{str(e)}")
+
+    def add_callback(self, callback: Callable[[], None]):
+        """注册取消回调，已取消时立即执行"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def wait(self, seconds: float) -> bool:
+        """等待指定时间，被取消时提前返回True"""
+        return self._event.wait(max(seconds, 0))
+
+
+class RunContext:
+    """
+    单次签到运行的时间预算：全局截止时间 + 单站点超时 + 取消令牌
+    """
+
+    def __init__(self, token: CancelToken = None, run_timeout: float = 0, site_timeout: float = 0,
+                 page_load_timeout: float = 60, script_timeout: float = 30, profiles=None,
+                 lean: bool = False, blocked_hosts: Optional[List[str]] = None, engine=None, selectors=None,
+                 http_session=None, asset_cache: bool = False):
+        self.token = token or CancelToken()
+        # 批量HTTP签到共用的连接池会话
+        self.http_session = http_session
+        # 浏览器共享静态资源缓存
+        self.asset_cache = asset_cache
+        # 候选选择器命中记录，为空时按配置顺序查找
+        self.selectors = selectors
+        # 浏览器引擎，为空时使用Selenium
+        self.engine = engine
+        # 持久化浏览器配置管理，为空时每次使用临时配置
+        self.profiles = profiles
+        # 轻量模式及屏蔽的第三方域名
+        self.lean = lean
+        self.blocked_hosts = blocked_hosts
+        self.run_timeout = run_timeout or 0
+        self.site_timeout = site_timeout or 0
+        self.page_load_timeout = page_load_timeout
+        self.script_timeout = script_timeout
+        self.run_deadline = time.monotonic() + self.run_timeout if self.run_timeout else None
+        self.site_deadline = self.run_deadline
+
+    def begin_site(self):
+        """开始处理新站点，重新计算站点截止时间"""
+        self.site_deadline = self.run_deadline
+        if self.site_timeout:
+            site_deadline = time.monotonic() + self.site_timeout
+            if self.site_deadline is None or site_deadline < self.site_deadline:
+                self.site_deadline = site_deadline
+
+    def remaining(self) -> Optional[float]:
+        """当前站点剩余时间，无限制时返回None"""
+        if self.site_deadline is None:
+            return None
+        return max(self.site_deadline - time.monotonic(), 0)
+
+    def run_expired(self) -> bool:
+        return self.run_deadline is not None and time.monotonic() >= self.run_deadline
+
+    def check(self):
+        """检查取消和超时，需要中止时抛出SigninCancelled"""
+        if self.token.cancelled:
+            raise SigninCancelled(self.token.reason or "任务已取消")
+        if self.run_expired():
+            raise SigninCancelled("已超出全局运行时间")
+        if self.site_deadline is not None and time.monotonic() >= self.site_deadline:
+            raise SigninCancelled("已超出站点签到时间")
+
+    def sleep(self, seconds: float):
+        """可被取消的等待，不会超出剩余预算"""
+        self.check()
+        remaining = self.remaining()
+        if remaining is not None and remaining < seconds:
+            self.token.wait(remaining)
+            self.check()
+            # 剩余预算不足以完成本次等待
+            raise SigninCancelled("已超出站点签到时间")
+        if self.token.wait(seconds):
+            self.check()
+
+    def bounded(self, timeout: float) -> float:
+        """将等待时长限制在剩余预算内"""
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return max(min(timeout, remaining), 0.1)
+
+
+class DriverWatchdog:
+    """
+    浏览器看门狗：站点超时或任务取消时强制关闭浏览器，打断卡死的driver调用
+    """
+
+    def __init__(self, session, context: RunContext, site_name: str = ""):
+        self._session = session
+        self._context = context
+        self._site_name = site_name
+        self._timer: Optional[threading.Timer] = None
+        self._killed = False
+        self._lock = threading.Lock()
+
+    def start(self) -> "DriverWatchdog":
+        remaining = self._context.remaining()
+        if remaining is not None:
+            self._timer = threading.Timer(remaining, self._on_timeout)
+            self._timer.daemon = True
+            self._timer.start()
+        self._context.token.add_callback(self.kill)
+        return self
+
+    def stop(self):
+        if self._timer:
+            self._timer.cancel()
+        self._context.token.remove_callback(self.kill)
+
+    @property
+    def killed(self) -> bool:
+        return self._killed
+
+    def _on_timeout(self):
+        logger.warning(f"{self._site_name}站点签到超时，强制关闭浏览器")
+        self.kill()
+
+    def kill(self):
+        """强制结束浏览器会话"""
+        with self._lock:
+            if self._killed:
+                return
+            self._killed = True
+        self._session.kill()
+
+
+class BrowserSlots:
+    """
+    浏览器并发槽位，限制同时运行的浏览器数量，并且只在可用内存足够时启动新的浏览器，等待时响应取消；
+    上限为0时按主机内存和CPU数自动确定
+    """
+
+    def __init__(self, limit: int = 1):
+        self._cond = threading.Condition()
+        self._limit = max(limit, 0)
+        self._in_use = 0
+
+    @property
+    def limit(self) -> int:
+        return self._limit or memory_admission.capacity()
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def resize(self, limit: int):
+        """调整并发上限，已占用的槽位不受影响"""
+        with self._cond:
+            self._limit = max(limit, 0)
+            self._cond.notify_all()
+
+    def acquire(self, context: RunContext):
+        """获取槽位，等待期间定期检查取消和超时"""
+        with self._cond:
+            logged = False
+            while self._in_use >= self.limit or not memory_admission.admits(self._in_use):
+                context.check()
+                if not logged and self._in_use < self.limit:
+                    logged = True
+                    logger.info(f"可用内存 {memory_admission.available_mb()} MB，"
+                                f"等待运行中的浏览器关闭后再启动新的浏览器")
+                self._cond.wait(1)
+            context.check()
+            self._in_use += 1
+
+    def release(self):
+        with self._cond:
+            self._in_use = max(self._in_use - 1, 0)
+            self._cond.notify()
+
+
+# 插件内所有浏览器共享的并发槽位
+browser_slots = BrowserSlots()